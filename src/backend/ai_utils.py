@@ -10,7 +10,10 @@ import logging
 import os
 import time
 from typing import Dict, List, Optional, Tuple, Union
-import math
+import threading
+import traceback
+from collections import Counter
+from functools import lru_cache
 
 import requests
 import json
@@ -20,10 +23,68 @@ import spacy # Added for entity extraction
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 
+from utils.batching import length_buckets
+from utils.tokens import CHARS_PER_TOKEN_ESTIMATE, estimate_tokens # Re-exported for existing callers
+
 
 logger = logging.getLogger(__name__)
 
-def summarize_text_local(text: str, model_id: str = "facebook/bart-large-cnn", progress_callback=None):
+# One keep-alive HTTP session per worker thread. API calls already run concurrently
+# in the Qt thread pool; reusing the connection skips the TCP/TLS handshake on
+# every request after the first one from a given thread.
+_http_local = threading.local()
+
+def _get_http_session() -> requests.Session:
+    """Return the calling thread's shared requests.Session, creating it on first use."""
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _http_local.session = session
+    return session
+
+# Held while a summarization pipeline is built, so the background preload and a
+# first request cannot both load (and double the memory of) the same model
+_summarizer_load_lock = threading.Lock()
+# Held around every call into a shared pipeline: workers share the cached pipeline,
+# and HF fast tokenizers raise "Already borrowed" when used from two threads at once
+_summarizer_call_lock = threading.Lock()
+# Local torch inference jobs that can run at the same time (see _summarizer_call_lock)
+LOCAL_INFERENCE_JOBS = 1
+
+def _load_summarization_pipeline(model_id: str, quantize: bool = False):
+    """Return the shared CPU summarization pipeline for ``model_id``, building it on first use."""
+    with _summarizer_load_lock:
+        return _build_summarization_pipeline(model_id, quantize)
+
+@lru_cache(maxsize=2)
+def _build_summarization_pipeline(model_id: str, quantize: bool = False):
+    """
+    Build (once per model) a CPU summarization pipeline.
+
+    With ``quantize``, the Linear layers are dynamically quantized to int8, which
+    roughly halves model memory and speeds up CPU inference but is lossy, so
+    summaries can differ from the fp32 model's. It is opt-in (ai.local_int8_quantization).
+    """
+    logger.info(f"Loading summarization model: {model_id}")
+    try:
+        # Fused scaled-dot-product attention; older transformers or unsupported architectures reject it
+        summarizer = pipeline("summarization", model=model_id, device=-1, model_kwargs={"attn_implementation": "sdpa"})
+    except (TypeError, ValueError, ImportError) as e:
+        logger.info(f"SDPA attention unavailable for {model_id}, using default attention: {e}")
+        summarizer = pipeline("summarization", model=model_id, device=-1)
+    if quantize:
+        try:
+            import torch
+            from torch.ao.quantization import quantize_dynamic
+            summarizer.model = quantize_dynamic(summarizer.model, {torch.nn.Linear}, dtype=torch.qint8)
+            logger.info(f"Model {model_id} quantized to int8.")
+        except Exception as e:
+            # Not every backend/build supports dynamic quantization; fp32 still works
+            logger.warning(f"int8 quantization unavailable for {model_id}, using fp32: {e}")
+    logger.info(f"Model {model_id} loaded successfully.")
+    return summarizer
+
+def summarize_text_local(text: str, model_id: str = "facebook/bart-large-cnn", progress_callback=None, quantize: bool = False):
     """
     Generate a summary of the given text using a local Hugging Face model via pipeline.
 
@@ -32,6 +93,7 @@ def summarize_text_local(text: str, model_id: str = "facebook/bart-large-cnn", p
         model_id (str, optional): The model ID to use for summarization. 
                                 Defaults to "facebook/bart-large-cnn".
         progress_callback (callable, optional): Callback function to report progress.
+        quantize (bool, optional): Use the int8-quantized model. Defaults to False.
 
     Returns:
         str: The generated summary.
@@ -44,16 +106,14 @@ def summarize_text_local(text: str, model_id: str = "facebook/bart-large-cnn", p
         if progress_callback:
             progress_callback(0)  # Indicate start
 
-        # Initialize the summarization pipeline
-        # device=-1 ensures CPU usage, change to 0 for GPU if available and configured
-        logger.info(f"Loading summarization model: {model_id}")
-        summarizer = pipeline("summarization", model=model_id, device=-1) 
-        logger.info(f"Model {model_id} loaded successfully.")
+        # Initialize the summarization pipeline (CPU, int8 when requested)
+        summarizer = _load_summarization_pipeline(model_id, quantize)
         
         # Perform summarization
         # Parameters like max_length, min_length can be adjusted based on desired output
         # These are common defaults for bart-large-cnn
-        summary_output = summarizer(text, max_length=150, min_length=30, do_sample=False)
+        with _summarizer_call_lock:
+            summary_output = summarizer(text, max_length=150, min_length=30, do_sample=False)
         
         if not summary_output or not isinstance(summary_output, list) or "summary_text" not in summary_output[0]:
             logger.error(f"Unexpected output format from summarization pipeline: {summary_output}")
@@ -74,10 +134,73 @@ def summarize_text_local(text: str, model_id: str = "facebook/bart-large-cnn", p
         logger.error(f"Error during local summarization with model {model_id}: {e}")
         if progress_callback:
             progress_callback(100)  # Indicate completion (with error)
-        import traceback
         logger.error(traceback.format_exc())
         raise RuntimeError(f"Failed to summarize text locally with model {model_id}: {e}")
 
+def summarize_texts_local(texts: List[str], model_id: str = "facebook/bart-large-cnn", progress_callback=None, quantize: bool = False) -> List[str]:
+    """
+    Generate summaries for several texts with a single local pipeline call.
+
+    The pipeline is loaded once and the texts are grouped into buckets of
+    similar token length, so each batched forward pass pads only to the
+    longest text in its bucket. Results are returned in input order.
+
+    Args:
+        texts (List[str]): The texts to summarize.
+        model_id (str, optional): The model ID to use for summarization.
+                                Defaults to "facebook/bart-large-cnn".
+        progress_callback (callable, optional): Callback function to report progress.
+        quantize (bool, optional): Use the int8-quantized model. Defaults to False.
+
+    Returns:
+        List[str]: One summary per input text, in input order.
+
+    Raises:
+        RuntimeError: If there's an error loading the model or during summarization.
+    """
+    logger.info(f"Starting local batch summarization with model: {model_id} for {len(texts)} texts")
+    try:
+        if progress_callback:
+            progress_callback(0)
+
+        summarizer = _load_summarization_pipeline(model_id, quantize)
+
+        # Run similar-length texts together so short notes are not padded out to the longest one
+        with _summarizer_call_lock:
+            token_lengths = [len(ids) for ids in summarizer.tokenizer(list(texts), truncation=True)["input_ids"]]
+        buckets = length_buckets(token_lengths)
+
+        summaries = [None] * len(texts)
+        for done, bucket in enumerate(buckets, start=1):
+            bucket_texts = [texts[i] for i in bucket]
+            # Locked per bucket so single requests can run between buckets
+            with _summarizer_call_lock:
+                summary_outputs = summarizer(bucket_texts, max_length=150, min_length=30, do_sample=False, batch_size=len(bucket_texts))
+
+            if not isinstance(summary_outputs, list) or len(summary_outputs) != len(bucket_texts):
+                logger.error(f"Unexpected output format from batch summarization pipeline: {summary_outputs}")
+                raise RuntimeError("Local batch summarization failed to produce expected output format.")
+
+            for index, output in zip(bucket, summary_outputs):
+                # The pipeline may wrap each item's result in a single-element list
+                if isinstance(output, list):
+                    output = output[0] if output else {}
+                if "summary_text" not in output:
+                    raise RuntimeError("Local batch summarization failed to produce expected output format.")
+                summaries[index] = output["summary_text"]
+
+            if progress_callback:
+                progress_callback(int(done * 100 / len(buckets)))
+
+        logger.info(f"Local batch summaries generated: {len(summaries)} in {len(buckets)} length bucket(s)")
+        return summaries
+
+    except Exception as e:
+        logger.error(f"Error during local batch summarization with model {model_id}: {e}")
+        if progress_callback:
+            progress_callback(100)  # Indicate completion (with error)
+        raise RuntimeError(f"Failed to summarize texts locally with model {model_id}: {e}")
+
 def summarize_text_hf_api(text: str, api_key: str, model_id: str = "facebook/bart-large-cnn", timeout: int = 120, progress_callback=None):
     """
     Generate a summary of the given text using the Hugging Face Inference API.
@@ -123,7 +246,7 @@ def summarize_text_hf_api(text: str, api_key: str, model_id: str = "facebook/bar
         if progress_callback:
             progress_callback(0) # Indicate start
 
-        response = requests.post(api_url, headers=headers, json=payload, timeout=timeout)
+        response = _get_http_session().post(api_url, headers=headers, json=payload, timeout=timeout)
         response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
         
         result = response.json()
@@ -234,7 +357,7 @@ def generate_text_hf_api(text_prompt: str, api_key: str, model_id: str = "gpt2",
         if progress_callback:
             progress_callback(0)  # Indicate start
 
-        response = requests.post(api_url, headers=headers, json=payload, timeout=timeout)
+        response = _get_http_session().post(api_url, headers=headers, json=payload, timeout=timeout)
         response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
         
         result = response.json()
@@ -397,11 +520,10 @@ def summarize_text_gemini_api(text: str, api_key: str, model_name: str = "gemini
     except Exception as e:
         logger.error(f"Unexpected error during Gemini API summarization: {e}")
         if progress_callback: progress_callback(100)
-        import traceback
         logger.error(traceback.format_exc())
         raise RuntimeError(f"Unexpected error during Gemini API summarization: {e}")
 
-def generate_text_gemini_api(text_prompt: str, api_key: str, model_name: str = "gemini-pro", progress_callback=None, max_output_tokens: int = 2048):
+def generate_text_gemini_api(text_prompt: str, api_key: str, model_name: str = "gemini-pro", progress_callback=None, max_output_tokens: int = 2048, chunk_callback=None):
     """
     Generate text using the Google Gemini API based on a prompt.
 
@@ -411,6 +533,8 @@ def generate_text_gemini_api(text_prompt: str, api_key: str, model_name: str = "
         model_name (str, optional): The Gemini model name. Defaults to "gemini-pro".
         progress_callback (callable, optional): Callback for progress (0 to 100).
         max_output_tokens (int, optional): Maximum number of tokens for the generated text.
+        chunk_callback (callable, optional): If given, the response is streamed and each
+            partial text chunk is passed to it as soon as it arrives.
 
     Returns:
         str: The generated text.
@@ -432,15 +556,28 @@ def generate_text_gemini_api(text_prompt: str, api_key: str, model_name: str = "
 
         if progress_callback: progress_callback(30) # After setup, before API call
 
-        response = model.generate_content(text_prompt, generation_config=generation_config)
+        if chunk_callback:
+            # Stream so the first words reach the UI without waiting for the full response
+            parts = []
+            for chunk in model.generate_content(text_prompt, generation_config=generation_config, stream=True):
+                if chunk.candidates and chunk.candidates[0].content.parts:
+                    parts.append(chunk.text)
+                    chunk_callback(chunk.text)
+            if not parts:
+                logger.error("Gemini API returned no valid candidates or parts in the streamed response for text generation.")
+                raise RuntimeError("Gemini API did not return valid generated text.")
+            if progress_callback: progress_callback(70)
+            generated_text = "".join(parts)
+        else:
+            response = model.generate_content(text_prompt, generation_config=generation_config)
 
-        if progress_callback: progress_callback(70) # After API call, before processing
+            if progress_callback: progress_callback(70) # After API call, before processing
 
-        if not response.candidates or not response.candidates[0].content.parts:
-            logger.error("Gemini API returned no valid candidates or parts in the response for text generation.")
-            raise RuntimeError("Gemini API did not return valid generated text.")
+            if not response.candidates or not response.candidates[0].content.parts:
+                logger.error("Gemini API returned no valid candidates or parts in the response for text generation.")
+                raise RuntimeError("Gemini API did not return valid generated text.")
 
-        generated_text = response.text
+            generated_text = response.text
         logger.info(f"Gemini API text generated. Length: {len(generated_text)}")
         
         if progress_callback: progress_callback(100)
@@ -465,10 +602,111 @@ def generate_text_gemini_api(text_prompt: str, api_key: str, model_name: str = "
     except Exception as e:
         logger.error(f"Unexpected error during Gemini API text generation: {e}")
         if progress_callback: progress_callback(100)
-        import traceback
         logger.error(traceback.format_exc())
         raise RuntimeError(f"Unexpected error during Gemini API text generation: {e}")
 
+@lru_cache(maxsize=2)
+def _load_spacy_model(model_id: str):
+    """Load (once per model) a spaCy model, downloading it first if it is not installed."""
+    try:
+        nlp = spacy.load(model_id)
+        logger.info(f"spaCy model '{model_id}' loaded successfully.")
+    except OSError:
+        logger.error(f"spaCy model '{model_id}' not found. Downloading...")
+        spacy.cli.download(model_id)
+        nlp = spacy.load(model_id)
+        logger.info(f"spaCy model '{model_id}' downloaded and loaded successfully.")
+    return nlp
+
+def _configure_torch_threads():
+    """
+    Give torch's intra-op threads every core but one, which is left for the GUI thread.
+
+    torch's thread count is process-wide, so it is sized by how many local
+    inference jobs can run at once, not by the worker pool: pipeline calls are
+    serialized by _summarizer_call_lock, so that is LOCAL_INFERENCE_JOBS.
+    """
+    try:
+        import torch
+        cores_per_job = (os.cpu_count() or 4) // LOCAL_INFERENCE_JOBS
+        torch.set_num_threads(max(1, cores_per_job - 1))
+    except Exception as e:
+        logger.warning(f"Could not configure torch thread count: {e}")
+
+# Representative input for the warm-up pass after compiling; long enough to exercise typical note lengths
+_WARMUP_TEXT = " ".join(["The quick brown fox jumps over the lazy dog."] * 40)
+
+def compile_summarization_model(model_id: str, quantize: bool = False) -> bool:
+    """
+    Compile the cached summarization model's forward pass with torch.compile and warm it up.
+
+    The first calls after compiling pay the graph-capture cost, so a warm-up summary is
+    run here, on the preload thread, rather than during the user's first request.
+
+    Args:
+        model_id (str): The summarization model to compile (loaded first if needed).
+        quantize (bool, optional): Compile the int8-quantized variant of the model.
+
+    Returns:
+        bool: True if the model was compiled, False if torch.compile is unavailable or failed.
+    """
+    summarizer = _load_summarization_pipeline(model_id, quantize)
+    try:
+        import torch
+        if not hasattr(torch, "compile"):
+            logger.info("torch.compile not available; keeping eager summarization model.")
+            return False
+        # forward is compiled in place so pipeline.generate() keeps using the same model object
+        with _summarizer_call_lock:
+            summarizer.model.forward = torch.compile(summarizer.model.forward, dynamic=True)
+            summarizer(_WARMUP_TEXT, max_length=150, min_length=30, do_sample=False)
+        logger.info(f"Summarization model {model_id} compiled and warmed up.")
+        return True
+    except Exception as e:
+        logger.warning(f"torch.compile failed for {model_id}, using eager mode: {e}")
+        # Drop the cached pipeline so the next load starts from an uncompiled model
+        with _summarizer_load_lock:
+            _build_summarization_pipeline.cache_clear()
+        return False
+
+def preload_models(summarization_model_id: Optional[str] = None, spacy_model_id: Optional[str] = None, progress_callback=None, compile_summarizer: bool = False, quantize_summarizer: bool = False) -> List[str]:
+    """
+    Load local models into the in-process caches so the first real request starts warm.
+
+    Args:
+        summarization_model_id (str, optional): Local summarization model to load, if any.
+        spacy_model_id (str, optional): spaCy model used for entity extraction, if any.
+        progress_callback (callable, optional): Callback for progress updates.
+        compile_summarizer (bool, optional): Also torch.compile and warm up the summarization model.
+        quantize_summarizer (bool, optional): Load the int8-quantized summarization model.
+
+    Returns:
+        List[str]: The model IDs that were loaded.
+    """
+    model_ids = [m for m in (summarization_model_id, spacy_model_id) if m]
+    if progress_callback: progress_callback(0)
+    if summarization_model_id:
+        _configure_torch_threads()
+        _load_summarization_pipeline(summarization_model_id, quantize_summarizer)
+        if compile_summarizer:
+            compile_summarization_model(summarization_model_id, quantize_summarizer)
+        if progress_callback: progress_callback(int(100 / len(model_ids)))
+    if spacy_model_id:
+        _load_spacy_model(spacy_model_id)
+        _non_ner_components(spacy_model_id)
+    if progress_callback: progress_callback(100)
+    logger.info(f"Preloaded models: {', '.join(model_ids) or 'none'}")
+    return model_ids
+
+# Pipeline components entity recognition needs; the rest (tagger, parser, lemmatizer...) are skipped
+_NER_COMPONENTS = frozenset(("tok2vec", "transformer", "ner", "entity_ruler"))
+
+@lru_cache(maxsize=2)
+def _non_ner_components(model_id: str) -> Tuple[str, ...]:
+    """Names of the loaded pipeline's components that entity extraction can skip."""
+    nlp = _load_spacy_model(model_id)
+    return tuple(name for name in nlp.pipe_names if name not in _NER_COMPONENTS)
+
 def extract_entities_spacy(text: str, model_id: str = "en_core_web_sm", progress_callback=None) -> List[str]:
     """
     Extract named entities from text using a spaCy model.
@@ -486,18 +724,11 @@ def extract_entities_spacy(text: str, model_id: str = "en_core_web_sm", progress
 
     entities = []
     try:
-        try:
-            nlp = spacy.load(model_id)
-            logger.info(f"spaCy model '{model_id}' loaded successfully.")
-        except OSError:
-            logger.error(f"spaCy model '{model_id}' not found. Downloading...")
-            spacy.cli.download(model_id)
-            nlp = spacy.load(model_id)
-            logger.info(f"spaCy model '{model_id}' downloaded and loaded successfully.")
+        nlp = _load_spacy_model(model_id)
         
         if progress_callback: progress_callback(50) # Model loaded
         
-        doc = nlp(text)
+        doc = nlp(text, disable=_non_ner_components(model_id))
         entities = [ent.text for ent in doc.ents]
         logger.info(f"Extracted {len(entities)} entities: {entities[:10]}...")
         
@@ -508,13 +739,47 @@ def extract_entities_spacy(text: str, model_id: str = "en_core_web_sm", progress
         # Return empty list as per contract, error already logged
     except Exception as e:
         logger.error(f"Error during spaCy entity extraction with model {model_id}: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         if progress_callback: progress_callback(100) # Error, but operation 'finished'
         # Return empty list as per contract, error already logged
     
     return entities
 
+def extract_entities_spacy_batch(texts: List[str], model_id: str = "en_core_web_sm", progress_callback=None) -> List[List[str]]:
+    """
+    Extract named entities from several texts in one spaCy ``nlp.pipe`` pass.
+
+    Args:
+        texts (List[str]): The texts to process.
+        model_id (str, optional): The spaCy model ID to use. Defaults to "en_core_web_sm".
+        progress_callback (callable, optional): Callback for progress updates.
+
+    Returns:
+        List[List[str]]: One list of entity texts per input text, in input order.
+                         Every list is empty on error.
+    """
+    logger.info(f"Starting batch entity extraction with spaCy model: {model_id} for {len(texts)} texts")
+    if progress_callback: progress_callback(0)
+
+    results = [[] for _ in texts]
+    try:
+        nlp = _load_spacy_model(model_id)
+
+        if progress_callback: progress_callback(50) # Model loaded
+
+        results = [[ent.text for ent in doc.ents] for doc in nlp.pipe(texts, disable=_non_ner_components(model_id))]
+        logger.info(f"Extracted entities for {len(results)} texts.")
+
+        if progress_callback: progress_callback(100)
+    except ImportError:
+        logger.error("spaCy library not found. Please ensure it is installed.")
+        if progress_callback: progress_callback(100) # Error, but operation 'finished'
+    except Exception as e:
+        logger.error(f"Error during spaCy batch entity extraction with model {model_id}: {e}", exc_info=True)
+        if progress_callback: progress_callback(100) # Error, but operation 'finished'
+
+    return results
+
 def extract_keywords_spacy(text: str, num_keywords: int = 5) -> List[str]:
     """
     Extract keywords from text using a spaCy model.
@@ -549,7 +814,6 @@ def extract_keywords_spacy(text: str, num_keywords: int = 5) -> List[str]:
         # Return empty list as per contract, error already logged
     except Exception as e:
         logger.error(f"Error during spaCy keyword extraction: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         # Return empty list as per contract, error already logged
     
@@ -584,7 +848,6 @@ def get_keywords_for_summarization(text: str, top_n: int = 5) -> List[str]:
         keywords = [word for word in words if word.isalnum() and word not in stop_words and len(word) > 2]
         
         # Get top N keywords (e.g., top 5)
-        from collections import Counter
         keyword_counts = Counter(keywords)
         top_keywords = [kw for kw, count in keyword_counts.most_common(top_n)]
         
@@ -596,16 +859,6 @@ def get_keywords_for_summarization(text: str, top_n: int = 5) -> List[str]:
         logger.error("Error in keyword extraction: " + str(e), exc_info=True)
         return []
 
-# Constants for token estimation (very rough)
-# Average characters per token can vary greatly by model and language.
-# 4 is a common general heuristic for English.
-CHARS_PER_TOKEN_ESTIMATE = 4 
-
-def estimate_tokens(text: str) -> int:
-    """Provides a very rough estimation of token count based on character length."""
-    if not text:
-        return 0
-    return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
 
 # Ensure the logger used in this module has handlers configured if run standalone
 # This is more for testing/running this file directly if needed
@@ -9,9 +9,79 @@ Handles file operations and text manipulation.
 import os
 import logging
 import shutil # Added for rmtree
+import stat
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Folders holding at least this many files are emptied by several threads at once
+PARALLEL_DELETE_MIN_FILES = 64
+PARALLEL_DELETE_WORKERS = 16
+
+def create_empty(path):
+    """
+    Create an empty file in a single open(O_CREAT | O_EXCL) call.
+
+    Args:
+        path (str): The file to create.
+
+    Raises:
+        FileExistsError: If something already exists at ``path``.
+    """
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+
+def _unlink_if_present(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _has_at_least_files(path, count):
+    """True if the tree under ``path`` holds ``count`` or more non-folder entries; stops scanning there."""
+    pending = [path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    count -= 1
+                    if count <= 0:
+                        return True
+    return False
+
+def remove_tree(path):
+    """
+    Delete a folder and everything in it.
+
+    Large folders have their files unlinked in parallel, since each unlink can
+    wait on the filesystem journal; the emptied folders are then removed
+    bottom-up. Small folders and symlinks go through shutil.rmtree unchanged.
+
+    Args:
+        path (str): The folder to delete.
+
+    Raises:
+        OSError: If any file or folder could not be removed.
+    """
+    if os.path.islink(path) or not _has_at_least_files(path, PARALLEL_DELETE_MIN_FILES):
+        shutil.rmtree(path) # Also refuses symlinks, as before
+        return
+    files, folders = [], []
+    for root, dirnames, filenames in os.walk(path, topdown=False):
+        files.extend(os.path.join(root, name) for name in filenames)
+        for name in dirnames:
+            child = os.path.join(root, name)
+            # Links to folders are removed as links, never followed
+            (files if os.path.islink(child) else folders).append(child)
+    with ThreadPoolExecutor(max_workers=PARALLEL_DELETE_WORKERS) as pool:
+        for _ in pool.map(_unlink_if_present, files): # Re-raises the first failure
+            pass
+    for folder in folders: # os.walk(topdown=False) listed them deepest first
+        os.rmdir(folder)
+    os.rmdir(path)
+
 class EditorLogic:
     """Handles the core logic for the text editor functionality."""
     
@@ -43,8 +113,8 @@ class EditorLogic:
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
-                logger.info(f"Successfully read file: {file_path}")
-                return content
+            logger.info(f"Successfully read file: {file_path}")
+            return content
         except IOError as e:
             logger.error(f"Error reading file {file_path}: {str(e)}")
             raise
@@ -66,14 +136,36 @@ class EditorLogic:
         logger.info(f"Writing to file: {file_path}")
         
         try:
+            # Write through symlinks so the link itself is kept
+            real_path = os.path.realpath(file_path)
+
             # Create directory if it doesn't exist
-            directory = os.path.dirname(file_path)
+            directory = os.path.dirname(real_path)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
                 logger.info(f"Created directory: {directory}")
             
-            with open(file_path, 'w', encoding='utf-8') as file:
-                file.write(content)
+            try:
+                existing = os.stat(real_path)
+            except FileNotFoundError:
+                existing = None
+            if existing is None or existing.st_nlink > 1:
+                # A new note has nothing to protect, and replacing a hard-linked
+                # note would detach it from its other names
+                with open(real_path, 'w', encoding='utf-8') as file:
+                    file.write(content)
+            else:
+                # Write to a unique file beside the target and swap it in, so an
+                # interrupted save never leaves a half-written note
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(real_path)}.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                        file.write(content)
+                    os.chmod(tmp_path, stat.S_IMODE(existing.st_mode))
+                    os.replace(tmp_path, real_path)
+                except BaseException:
+                    _unlink_if_present(tmp_path)
+                    raise
                 
             logger.info(f"Successfully wrote to file: {file_path}")
             return True
@@ -132,12 +224,11 @@ class EditorLogic:
                 os.makedirs(directory)
                 logger.info(f"Created directory for new file: {directory}")
             
-            if os.path.exists(file_path):
+            try:
+                create_empty(file_path)
+            except FileExistsError:
                 logger.warning(f"File already exists: {file_path}")
                 return False, f"File already exists: {os.path.basename(file_path)}"
-
-            with open(file_path, 'w', encoding='utf-8') as _: # Changed f to _ to indicate unused variable
-                pass  # Create an empty file
             logger.info(f"Successfully created empty file: {file_path}")
             return True, f"File '{os.path.basename(file_path)}' created successfully."
         except IOError as e:
@@ -185,10 +276,6 @@ class EditorLogic:
             tuple: (bool, str, Optional[str]) indicating success, a message, and the new_path if successful.
         """
         logger.info(f"Attempting to rename item: {old_path} to {new_name}")
-        if not os.path.exists(old_path):
-            logger.error(f"Item not found for rename: {old_path}")
-            return False, "Item not found.", None
-        
         if not new_name.strip():
             logger.warning("New name for rename is empty or whitespace.")
             return False, "New name cannot be empty.", None
@@ -196,14 +283,20 @@ class EditorLogic:
         directory = os.path.dirname(old_path)
         new_path = os.path.join(directory, new_name)
 
-        if os.path.exists(new_path):
-            logger.warning(f"Target path already exists: {new_path}")
-            return False, f"An item named '{new_name}' already exists in this location.", None
-        
         try:
+            # A missing source surfaces as FileNotFoundError from rename(); the target still
+            # needs one probe because POSIX rename() silently replaces an existing file
+            if os.path.lexists(new_path):
+                raise FileExistsError(new_path)
             os.rename(old_path, new_path)
             logger.info(f"Successfully renamed {old_path} to {new_path}")
             return True, f"Successfully renamed to '{new_name}'.", new_path
+        except FileNotFoundError:
+            logger.error(f"Item not found for rename: {old_path}")
+            return False, "Item not found.", None
+        except FileExistsError:
+            logger.warning(f"Target path already exists: {new_path}")
+            return False, f"An item named '{new_name}' already exists in this location.", None
         except OSError as e:
             logger.error(f"OSError renaming {old_path} to {new_path}: {str(e)}")
             return False, f"Error renaming: {str(e)}", None
@@ -228,7 +321,7 @@ class EditorLogic:
 
         try:
             if os.path.isdir(item_path):
-                shutil.rmtree(item_path)
+                remove_tree(item_path)
                 logger.info(f"Successfully deleted directory: {item_path}")
                 return True, f"Folder '{os.path.basename(item_path)}' deleted successfully."
             else:
@@ -6,19 +6,78 @@ Controller for AI summarization operations.
 """
 
 import logging
-import sys
-import traceback
-from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, pyqtSlot, QThreadPool
+import os
+import time
+from collections import deque
+from functools import partial
+from PyQt5.QtCore import Qt, QObject, QMetaObject, Q_ARG, pyqtSignal, pyqtSlot, QThreadPool, QTimer
 
 # Import AI utilities
-from utils.threads import WorkerSignals, EntityExtractionWorker
+from utils.threads import Worker
 
 logger = logging.getLogger(__name__)
 
 _AICONTR_ERROR_AIMANAGER_NOT_INIT = "AIManager not initialized"
+# Shared pool size: keep one core free for the GUI thread, but always allow an API call
+# to run alongside a local model job
+AI_POOL_MAX_THREADS = max(2, (os.cpu_count() or 4) - 1)
+
+# Built once; emitted whenever a request arrives and AIManager could not be brought up
+_AIMANAGER_NOT_INIT_ERR = (AttributeError, AttributeError(_AICONTR_ERROR_AIMANAGER_NOT_INIT), None)
+_ENTITY_NOT_INIT_ERR = (_AICONTR_ERROR_AIMANAGER_NOT_INIT, "AIManager not available for entity extraction.")
+
+def _import_ai_stack(progress_callback=None):
+    """Import the AIManager module (and with it transformers/spaCy) into sys.modules."""
+    import managers.ai_manager  # noqa: F401
+
+class _RequestBatcher(QObject):
+    """
+    Coalesces requests of the same task that arrive within a short window.
+
+    Each task has its own queue. The first request arms a single-shot timer; when it
+    fires (or a queue reaches ``max_batch_size``) the queued payloads are handed, in
+    arrival order, to the task's flush handler as one list.
+    """
+
+    def __init__(self, flush_handlers: dict, max_batch_size: int, window_ms: int, parent=None):
+        super().__init__(parent)
+        self._flush_handlers = flush_handlers
+        self._queues = {task: deque() for task in flush_handlers}
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+        self._flush_scheduled = False
+
+    def enqueue(self, task: str, payload):
+        """Queue a payload for ``task`` and make sure a flush is scheduled."""
+        queue = self._queues[task]
+        queue.append(payload)
+        if len(queue) >= self.max_batch_size:
+            self._flush_task(task)
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(self.window_ms, self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+        for task in self._queues:
+            self._flush_task(task)
+
+    def _flush_task(self, task: str):
+        queue = self._queues[task]
+        while queue:
+            batch = [queue.popleft() for _ in range(min(len(queue), self.max_batch_size))]
+            logger.debug("AIController: Flushing %d queued '%s' request(s).", len(batch), task)
+            self._flush_handlers[task](batch)
+
 
 class AIController(QObject):
     """Controller for AI summarization operations."""
+
+    # Summarization/entity requests arriving within BATCH_WINDOW_MS are sent to AIManager together
+    BATCH_MAX_SIZE = 32
+    BATCH_WINDOW_MS = 50
+    # Progress ticks closer together than this are dropped (100% is always delivered)
+    PROGRESS_MIN_INTERVAL_S = 0.05
     
     # Define signals for summarization
     summarization_started = pyqtSignal()
@@ -31,6 +90,7 @@ class AIController(QObject):
     text_generation_started = pyqtSignal()
     text_generation_progress = pyqtSignal(int)
     text_generation_result = pyqtSignal(str)
+    text_generation_chunk = pyqtSignal(str) # Partial text while a streaming backend is still generating
     text_generation_error = pyqtSignal(tuple)
     text_generation_finished = pyqtSignal()
     
@@ -61,130 +121,307 @@ class AIController(QObject):
         super().__init__()
         self.main_window = main_window
         self.settings_model = settings_model
-        self.thread_pool = QThreadPool()
-        
-        # Import AI manager here to avoid circular imports
-        from managers.ai_manager import AIManager
-        self.ai_manager = AIManager(self, self.settings_model)
-        
-        # Connect AI manager signals
-        self._connect_ai_manager_signals()
+        # Same pool AIManager dispatches to, so all AI work shares one right-sized set of threads
+        self.thread_pool = QThreadPool.globalInstance()
+        self.thread_pool.setMaxThreadCount(AI_POOL_MAX_THREADS)
+        # Per-task (result, error, finished, error-message prefix) used by the shared relay slots
+        self._task_table = {
+            "summarization": (self.summarization_result, self.summarization_error, self.summarization_finished, "Summarization Failed: "),
+            "generation": (self.text_generation_result, self.text_generation_error, self.text_generation_finished, ""),
+        }
+        # [last emitted value, monotonic time of last emit, dropped value awaiting delivery] per task
+        self._summ_progress = [-1, 0.0, None]
+        self._gen_progress = [-1, 0.0, None]
+        self._batcher = _RequestBatcher(
+            {
+                "summarize": self._dispatch_summarization_batch,
+                "extract": self._dispatch_entity_extraction_batch,
+            },
+            max_batch_size=self.BATCH_MAX_SIZE,
+            window_ms=self.BATCH_WINDOW_MS,
+            parent=self,
+        )
+
+        # AIManager is built on first use; importing it pulls in the whole AI stack
+        self._ai_manager = None
+        self._ai_ready = False
+        self._warmup_started = False
+        self._warmup_in_flight = False
+        self._queued = [] # (method, args) received while the background warm-up was still importing
+        self._preload_started = False
+
+    @property
+    def ai_manager(self):
+        """The AIManager instance, constructed and connected on first access."""
+        return self._get_or_create_ai_manager()
+
+    def _get_or_create_ai_manager(self):
+        if self._ai_manager is None:
+            # Import AI manager here to avoid circular imports and keep it off the startup path
+            from managers.ai_manager import AIManager
+            self._ai_manager = AIManager(self, self.settings_model)
+            self._connect_ai_manager_signals()
+        return self._ai_manager
+
+    def _ensure_ai_ready(self) -> bool:
+        """Return True once AIManager is built and connected, building it on first call."""
+        if not self._ai_ready:
+            try:
+                self._get_or_create_ai_manager()
+            except Exception as e:
+                logger.error(f"AIController: Failed to initialize AIManager: {e}")
+        return self._ai_ready
+
+    def warm_up_ai_manager(self):
+        """Import the AI stack on a pool thread, then build the AIManager back on this thread."""
+        if self._ai_manager is not None or self._warmup_started:
+            return
+        self._warmup_started = True
+        self._warmup_in_flight = True
+        worker = Worker(_import_ai_stack)
+        # The import itself is the slow part; constructing the QObject afterwards is cheap
+        worker.signals.finished.connect(self._on_ai_stack_imported)
+        self.thread_pool.start(worker)
+
+    def _on_ai_stack_imported(self):
+        logger.info("AIController: AI stack imported in background.")
+        self._warmup_in_flight = False
+        ready = self._ensure_ai_ready()
+        # Replay requests that arrived mid-import; on failure each one emits its own error
+        queued, self._queued = self._queued, []
+        for method, args in queued:
+            method(*args)
+        if ready:
+            self.preload_models()
+
+    def _defer_until_warm(self, method, *args) -> bool:
+        """Queue a request while the background import runs instead of importing on this thread."""
+        if not self._warmup_in_flight:
+            return False
+        logger.info(f"AIController: AI stack still loading; queueing {method.__name__}.")
+        self._queued.append((method, args))
+        return True
+
+    def preload_models(self):
+        """Load the configured local models on a pool thread so the first request does not pay for it."""
+        if self._preload_started or not self._ensure_ai_ready():
+            return
+        self._preload_started = True
+        worker = Worker(self._ai_manager.preload)
+        worker.signals.result.connect(self._on_models_preloaded)
+        worker.signals.error.connect(self._on_models_preload_failed)
+        self.thread_pool.start(worker)
+
+    def _on_models_preloaded(self, model_ids):
+        self.model_preload_result.emit(True, ", ".join(model_ids))
+
+    def _on_models_preload_failed(self, error_tuple):
+        # Background warm-up failing is not fatal; the first real request retries the load
+        logger.warning(f"AIController: Model preload failed: {error_tuple[1]}")
+        self._preload_started = False
+        self.model_preload_result.emit(False, str(error_tuple[1]))
 
     # --- Public Methods to Trigger AI Operations ---
     def summarize_text(self, text: str):
         """Request text summarization from the AI Manager."""
         logger.info("AIController: summarize_text called.")
-        if hasattr(self, 'ai_manager') and self.ai_manager:
-            self.ai_manager.summarize_text(text)
+        if not text or text.isspace():
+            # Nothing to summarize; answer here instead of running the model on a worker
+            self.summarization_result.emit("")
+            self.summarization_finished.emit()
+            return
+        if self._defer_until_warm(self.summarize_text, text):
+            return
+        if self._ensure_ai_ready():
+            cached = self._ai_manager.cached_result("summarization", text)
+            if cached is not None:
+                self._emit_cached("summarization", cached)
+                return
+            self._batcher.enqueue("summarize", text)
         else:
             logger.error(f"AIController: AIManager not available for summarization. {_AICONTR_ERROR_AIMANAGER_NOT_INIT}")
-            self.summarization_error.emit((type(AttributeError(_AICONTR_ERROR_AIMANAGER_NOT_INIT)), AttributeError(_AICONTR_ERROR_AIMANAGER_NOT_INIT), None))
+            self.summarization_error.emit(_AIMANAGER_NOT_INIT_ERR)
 
     def request_text_generation(self, prompt_text: str, max_new_tokens: int = 2048):
         """Request text generation from the AI Manager."""
         logger.info("AIController: request_text_generation called.")
-        if hasattr(self, 'ai_manager') and self.ai_manager:
+        if not prompt_text or prompt_text.isspace():
+            self.text_generation_result.emit("")
+            self.text_generation_finished.emit()
+            return
+        if self._defer_until_warm(self.request_text_generation, prompt_text, max_new_tokens):
+            return
+        if self._ensure_ai_ready():
+            cached = self._ai_manager.cached_result("generation", prompt_text, max_new_tokens)
+            if cached is not None:
+                self._emit_cached("generation", cached)
+                return
+            # Not batched: no backend batches generation, so waiting out the window only adds latency
             self.ai_manager.generate_text(prompt_text, max_new_tokens)
         else:
             logger.error(f"AIController: AIManager not available for text generation. {_AICONTR_ERROR_AIMANAGER_NOT_INIT}")
-            self.text_generation_error.emit((type(AttributeError(_AICONTR_ERROR_AIMANAGER_NOT_INIT)), AttributeError(_AICONTR_ERROR_AIMANAGER_NOT_INIT), None))
+            self.text_generation_error.emit(_AIMANAGER_NOT_INIT_ERR)
 
     def extract_entities(self, text: str):
         """Request entity extraction from the AI Manager."""
         logger.info("AIController: extract_entities called.")
-        if hasattr(self, 'ai_manager') and self.ai_manager:
-            self.ai_manager.extract_entities(text)
+        if not text or text.isspace():
+            self.entities_extracted.emit([])
+            self.entity_extraction_finished.emit()
+            return
+        if self._defer_until_warm(self.extract_entities, text):
+            return
+        if self._ensure_ai_ready():
+            cached = self._ai_manager.cached_result("entities", text)
+            if cached is not None:
+                self._emit_cached("entities", cached)
+                return
+            self._batcher.enqueue("extract", text)
         else:
-            self.entity_extraction_error.emit((_AICONTR_ERROR_AIMANAGER_NOT_INIT, "AIManager not available for entity extraction."))
+            self.entity_extraction_error.emit(_ENTITY_NOT_INIT_ERR)
             logger.error(_AICONTR_ERROR_AIMANAGER_NOT_INIT)
 
+    def _emit_cached(self, task: str, result):
+        """Deliver a cached result on the next event-loop turn, keeping the usual asynchronous ordering."""
+        logger.debug("AIController: Serving %s request from result cache.", task)
+        # A queued call posts one event to this object; no timer or closure per hit
+        QMetaObject.invokeMethod(self, "_deliver_cached", Qt.QueuedConnection,
+                                 Q_ARG(str, task), Q_ARG("PyQt_PyObject", result))
+
+    @pyqtSlot(str, "PyQt_PyObject")
+    def _deliver_cached(self, task: str, result):
+        """Emit a cached ``result`` for ``task`` exactly as a fresh one would be."""
+        if task == "entities":
+            self.entities_extracted.emit(list(result))
+            self.entity_extraction_finished.emit()
+        else:
+            self._on_result(task, result)
+
+    def clear_cache(self):
+        """Forget every cached AI result, in memory and on disk."""
+        if self._ensure_ai_ready():
+            self._ai_manager.result_cache.clear()
+            self._ai_manager.similar_cache.clear()
+            logger.info("AIController: AI result cache cleared.")
+
+    # --- Batch Dispatch (called by the request batcher) ---
+    def _dispatch_summarization_batch(self, texts: list):
+        self.ai_manager.summarize_batch(texts)
+
+    def _dispatch_entity_extraction_batch(self, texts: list):
+        self.ai_manager.extract_entities_batch(texts)
+
     # --- AI Manager Signal Handlers ---
     def _connect_ai_manager_signals(self):
         """Connect signals from AIManager to AIController's handlers."""
-        if not hasattr(self, 'ai_manager') or self.ai_manager is None:
+        if self._ai_manager is None:
             logger.error("AIController: AIManager not initialized before connecting signals.")
             return
 
+        manager = self._ai_manager
+
+        # Pure pass-throughs are signal-to-signal with DirectConnection so a relay
+        # re-emits in place instead of adding another event-loop hop per tick.
+        # finished is emitted once per request by _on_result/_on_error, so AIManager's
+        # finished signals (one per worker, possibly per batch) are not relayed as well.
         # Summarization signals
-        self.ai_manager.summarization_started_signal.connect(self._handle_task_started_status) # Generic handler
-        self.ai_manager.summarization_progress_signal.connect(self.summarization_progress) # Direct pass-through
-        self.ai_manager.summarization_result_signal.connect(self._handle_summarization_result)
-        self.ai_manager.summarization_error_signal.connect(self._handle_summarization_error)
-        self.ai_manager.summarization_finished_signal.connect(self.summarization_finished) # Direct pass-through
+        manager.summarization_started_signal.connect(self.summarization_started, Qt.DirectConnection) # Direct pass-through
+        manager.summarization_started_signal.connect(self._on_summarization_started)
+        manager.summarization_progress_signal.connect(self._on_summ_progress) # Throttled
+        manager.summarization_result_signal.connect(partial(self._on_result, "summarization"))
+        manager.summarization_error_signal.connect(partial(self._on_error, "summarization"))
 
         # Text Generation signals
-        self.ai_manager.text_generation_started_signal.connect(self._handle_task_started_status) # Generic handler
-        self.ai_manager.text_generation_progress_signal.connect(self.text_generation_progress) # Direct pass-through
-        self.ai_manager.text_generation_result_signal.connect(self._handle_text_generation_result)
-        self.ai_manager.text_generation_error_signal.connect(self._handle_text_generation_error)
-        self.ai_manager.text_generation_finished_signal.connect(self.text_generation_finished) # Direct pass-through
+        manager.text_generation_started_signal.connect(self.text_generation_started, Qt.DirectConnection) # Direct pass-through
+        manager.text_generation_started_signal.connect(self._on_generation_started)
+        manager.text_generation_progress_signal.connect(self._on_gen_progress) # Throttled
+        manager.text_generation_chunk_signal.connect(self.text_generation_chunk, Qt.DirectConnection) # Direct pass-through
+        manager.text_generation_result_signal.connect(partial(self._on_result, "generation"))
+        manager.text_generation_error_signal.connect(partial(self._on_error, "generation"))
         
         # Entity Extraction signals
-        self.ai_manager.entity_extraction_started_signal.connect(self.entity_extraction_started.emit)
-        self.ai_manager.entity_extraction_result_signal.connect(self.entities_extracted.emit)
-        self.ai_manager.entity_extraction_error_signal.connect(self.entity_extraction_error.emit)
-        self.ai_manager.entity_extraction_finished_signal.connect(self.entity_extraction_finished.emit)
+        manager.entity_extraction_started_signal.connect(self.entity_extraction_started, Qt.DirectConnection)
+        manager.entity_extraction_result_signal.connect(self.entities_extracted, Qt.DirectConnection)
+        manager.entity_extraction_error_signal.connect(self.entity_extraction_error, Qt.DirectConnection)
+        manager.entity_extraction_finished_signal.connect(self.entity_extraction_finished, Qt.DirectConnection)
 
         # General error signal from AIManager (e.g., config issues)
-        self.ai_manager.general_error_signal.connect(self._handle_ai_manager_general_error)
-
-    @pyqtSlot(str)  # result_text
-    def _handle_summarization_result(self, result_text: str):
-        logger.info("AIController: Received summarization result.")
-        self.summarization_result.emit(result_text)
-        self.summarization_finished.emit()
-
-    @pyqtSlot(tuple)  # error_tuple (e.g., (type, value, tb_str))
-    def _handle_summarization_error(self, error_tuple: tuple):
-        error_type = error_tuple[0] if len(error_tuple) > 0 else Exception
-        error_message = str(error_tuple[1]) if len(error_tuple) > 1 else str(error_type)
-        tb_str = error_tuple[2] if len(error_tuple) > 2 else ""
-        
-        logger.error(f"AIController: Received summarization error: {error_message}")
-        # Emit a 3-tuple: (Exception Type, Formatted Message, Traceback String)
-        self.summarization_error.emit((error_type, f"Summarization Failed: {error_message}", tb_str))
-        self.summarization_finished.emit()
-
-    @pyqtSlot(str)  # generated_text
-    def _handle_text_generation_result(self, generated_text: str):
-        logger.info("AIController: Received text generation result.")
-        self.text_generation_result.emit(generated_text)
-        self.text_generation_finished.emit()
-
-    @pyqtSlot(tuple)  # error_tuple (e.g., (type, value, tb_str))
-    def _handle_text_generation_error(self, error_tuple: tuple):
-        error_message = str(error_tuple[1]) if len(error_tuple) > 1 else str(error_tuple[0])
-        logger.error("AIController: Received text generation error: " + error_message)
-        # Ensure the full error details (type, message, traceback) are propagated
-        if len(error_tuple) == 3:
-            self.text_generation_error.emit(error_tuple)
-        elif len(error_tuple) == 2:
-            # If AIManager sent a 2-tuple, adapt it. Preferable to fix AIManager.
-            logger.warning("AIController: Received 2-tuple error from AIManager. Adapting to 3-tuple with None traceback.")
-            self.text_generation_error.emit((error_tuple[0], error_tuple[1], None))
-        else:
-            # Fallback for unexpected tuple size
-            logger.error(f"AIController: Received unexpected error_tuple size: {len(error_tuple)}. Emitting generic error.")
-            self.text_generation_error.emit((RuntimeError, "Unknown error structure from AIManager", None))
-        self.text_generation_finished.emit()
-
-    @pyqtSlot() # Connected to summarization_started_signal and text_generation_started_signal
-    def _handle_task_started_status(self):
-        # Determine which task started if necessary, or use a generic message
-        # For now, a generic log. Could be enhanced to show specific task type.
-        sender_signal_name = self.sender().objectName() if self.sender() else "UnknownSignal"
-        
-        if "summarization" in sender_signal_name:
-            task_name = "Summarization"
-        elif "generation" in sender_signal_name:
-            task_name = "Text Generation"
-        else:
-            task_name = "AI Task"
-            
-        status_message = task_name + " started by AIManager."
-        logger.info("AIController: AIManager status update: " + status_message)
-        # Emit a general status signal or update UI if needed
-        # Example: self.main_window.show_status_message(status_message)
+        manager.general_error_signal.connect(self._handle_ai_manager_general_error)
+
+        self._ai_ready = True
+
+    def _on_result(self, task: str, result_text: str):
+        """Relay a result for ``task`` ("summarization" or "generation") and mark it finished."""
+        result_signal, _, finished_signal, _ = self._task_table[task]
+        logger.info("AIController: Received %s result.", task)
+        result_signal.emit(result_text)
+        finished_signal.emit()
+
+    @staticmethod
+    def _adapt_err(error_tuple: tuple) -> tuple:
+        """Normalize a 1-, 2- or 3-tuple from a worker into (type, message, traceback-or-None)."""
+        n = len(error_tuple)
+        if n == 3:
+            return error_tuple
+        if n == 2:
+            return (error_tuple[0], error_tuple[1], None)
+        error_type = error_tuple[0] if n else RuntimeError
+        return (error_type, error_type, None)
+
+    def _on_error(self, task: str, error_tuple: tuple):
+        """Relay an error for ``task`` as a (type, message, traceback) 3-tuple and mark it finished."""
+        _, error_signal, finished_signal, message_prefix = self._task_table[task]
+        error_type, error_message, tb_str = self._adapt_err(error_tuple)
+
+        logger.error("AIController: Received %s error: %s", task, error_message)
+        error_signal.emit((error_type, message_prefix + str(error_message), tb_str))
+        finished_signal.emit()
+
+    def _throttle_progress(self, state: list, signal, value: int):
+        """Forward ``value`` only if it advanced and enough time passed since the last one, or it is 100.
+
+        A value dropped inside the interval is delivered when the interval ends (trailing edge),
+        so the bar never sits on a stale value while the task goes quiet. ``value`` is the
+        combined progress AIManager reports for all running workers of the task, so one
+        state per task is enough.
+        """
+        now = time.monotonic()
+        elapsed = now - state[1]
+        if value >= 100 or (value > state[0] and elapsed >= self.PROGRESS_MIN_INTERVAL_S):
+            state[0] = value
+            state[1] = now
+            state[2] = None
+            signal.emit(value)
+        elif value > state[0]:
+            if state[2] is None:
+                delay_ms = int((self.PROGRESS_MIN_INTERVAL_S - elapsed) * 1000) + 1
+                QTimer.singleShot(delay_ms, partial(self._flush_progress, state, signal))
+            state[2] = value
+
+    def _flush_progress(self, state: list, signal):
+        value, state[2] = state[2], None
+        if value is not None and value > state[0]:
+            state[0] = value
+            state[1] = time.monotonic()
+            signal.emit(value)
+
+    @pyqtSlot(int)
+    def _on_summ_progress(self, value: int):
+        self._throttle_progress(self._summ_progress, self.summarization_progress, value)
+
+    @pyqtSlot(int)
+    def _on_gen_progress(self, value: int):
+        self._throttle_progress(self._gen_progress, self.text_generation_progress, value)
+
+    @pyqtSlot()
+    def _on_summarization_started(self):
+        self._summ_progress[:] = (-1, 0.0, None)
+        logger.info("AIController: AIManager status update: Summarization started by AIManager.")
+
+    @pyqtSlot()
+    def _on_generation_started(self):
+        self._gen_progress[:] = (-1, 0.0, None)
+        logger.info("AIController: AIManager status update: Text Generation started by AIManager.")
 
     @pyqtSlot(str)  # error_message
     def _handle_ai_manager_general_error(self, error_message: str):
@@ -5,21 +5,26 @@
 Controller for context analysis operations.
 """
 
+import copy
 import logging
 import traceback
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, QMetaObject, Q_ARG, pyqtSignal, pyqtSlot
+
+from utils.result_cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
 class ContextController(QObject):
     """Controller for context analysis operations."""
-    
+
     # Define signals
     context_analysis_started = pyqtSignal()
     context_analysis_progress = pyqtSignal(int)
     context_analysis_error = pyqtSignal(str)
     context_analysis_finished = pyqtSignal()
     suggestions_ready = pyqtSignal(dict)
+
+    SUGGESTION_CACHE_SIZE = 16 # Notes whose suggestions are kept for re-analysis
     
     def __init__(self, main_window):
         """Initialize the context controller."""
@@ -32,6 +37,10 @@ class ContextController(QObject):
         
         # Store the current suggestions
         self.current_suggestions = {}
+
+        # Suggestions by note text; re-analysing an unchanged note skips the pipeline
+        self._suggestion_cache = ResultCache(self.SUGGESTION_CACHE_SIZE)
+        self._pending_key = None
         
         # Connect context manager signals
         self._connect_context_manager_signals()
@@ -40,7 +49,8 @@ class ContextController(QObject):
         """Set up callback methods for the context manager."""
         # The ContextManager doesn't use these signals directly, but calls methods on its parent
         # We'll connect to the signals that do exist
-        self.context_manager.progress_signal.connect(self._on_progress)
+        # Progress needs no bookkeeping: forward signal-to-signal without a Python slot
+        self.context_manager.progress_signal.connect(self.context_analysis_progress)
         self.context_manager.error_signal.connect(self._on_error)
         self.context_manager.suggestions_ready_signal.connect(self._on_suggestions_ready)
         self.context_manager.models_loaded_signal.connect(self._on_models_loaded)
@@ -52,6 +62,13 @@ class ContextController(QObject):
         Args:
             suggestions (dict): The generated suggestions
         """
+        if self._pending_key is not None:
+            # Cached separately from the emitted dict, which consumers may modify
+            self._suggestion_cache.put(self._pending_key, copy.deepcopy(suggestions))
+            self._pending_key = None
+        self._emit_suggestions(suggestions)
+
+    def _emit_suggestions(self, suggestions):
         # Store the suggestions
         self.current_suggestions = suggestions
         
@@ -59,15 +76,12 @@ class ContextController(QObject):
         self.suggestions_ready.emit(suggestions)
         self.context_analysis_finished.emit()
         
-    def _on_progress(self, progress):
-        """
-        Handle the progress signal from the context manager.
-        
-        Args:
-            progress (int): The progress percentage
-        """
-        self.context_analysis_progress.emit(progress)
-        
+    @pyqtSlot("PyQt_PyObject")
+    def _deliver_cached(self, suggestions):
+        """Emit cached ``suggestions`` exactly as freshly generated ones would be."""
+        # Not through _on_suggestions_ready: a newer analysis may own _pending_key by now
+        self._emit_suggestions(suggestions)
+
     def _on_error(self, error_msg):
         """
         Handle the error signal from the context manager.
@@ -75,6 +89,7 @@ class ContextController(QObject):
         Args:
             error_msg (str): The error message
         """
+        self._pending_key = None
         self.context_analysis_error.emit(error_msg)
         self.context_analysis_finished.emit()
         
@@ -98,6 +113,18 @@ class ContextController(QObject):
         """
         # Emit the started signal
         self.context_analysis_started.emit()
+
+        key = ResultCache.make_key("context", note_text)
+        cached = self._suggestion_cache.get(key)
+        if cached is not None:
+            logger.debug("ContextController: Reusing suggestions for unchanged note.")
+            self._pending_key = None
+            # Delivered on the next event-loop turn, like a fresh analysis, and as a copy
+            # so consumers cannot modify the cached entry
+            QMetaObject.invokeMethod(self, "_deliver_cached", Qt.QueuedConnection,
+                                     Q_ARG("PyQt_PyObject", copy.deepcopy(cached)))
+            return
+        self._pending_key = key
         
         try:
             # Call the manager to analyze the context
@@ -107,6 +134,10 @@ class ContextController(QObject):
             # We don't emit the finished signal here because it will be emitted by the callbacks
             
         except Exception as e:
+            # Kept broad: an exception escaping a Qt slot aborts the application under PyQt5,
+            # so unexpected failures are logged with their traceback rather than re-raised
+            logger.exception("ContextController: Context analysis could not be started")
+            self._pending_key = None
             error_info = str(e)
             self.context_analysis_error.emit(error_info)
             self.context_analysis_finished.emit()
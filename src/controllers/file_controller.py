@@ -5,25 +5,61 @@
 Controller for file operations.
 """
 
+import itertools
 import os
 import logging
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
+from PyQt5.QtGui import QTextCursor
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 
 # Import editor logic
-from backend.editor_logic import EditorLogic
+from backend.editor_logic import EditorLogic, create_empty, remove_tree
+from utils.threads import Worker
+from utils.result_cache import ResultCache
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 # Constants for dialog titles
-ERROR_OPENING_FILE_TITLE = "Error Opening File"
 ERROR_SAVING_FILE_TITLE = "Error Saving File"
 CONFIRM_SAVE_TITLE = "Unsaved Changes"
 CONFIRM_SAVE_TEXT = "You have unsaved changes. Do you want to save them?"
+ERROR_STATUS_TIMEOUT_MS = 8000 # How long a non-modal error stays in the status bar
+WINDOW_TITLE_SUFFIX = " - Smart Contextual Notes Editor"
+NOTE_FILE_FILTER = "Text Files (*.txt);;Markdown Files (*.md);;All Files (*)"
+# Notes longer than this are inserted in slices across event-loop turns
+LARGE_NOTE_CHARS = 1024 * 1024
+NOTE_INSERT_CHUNK_CHARS = 64 * 1024
+# Recently read notes kept in memory, so flipping between notes skips the disk read
+NOTE_READ_CACHE_SIZE = 8
+# Settings changes within this window are written to disk once
+SETTINGS_SAVE_DELAY_MS = 500
+
+# One writer keeps settings-file writes ordered and off the GUI thread
+_SETTINGS_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settings-writer")
+
+@lru_cache(maxsize=256)
+def _split_path(file_path: str) -> Tuple[str, str, str]:
+    """Return (dirname, basename, extension) of ``file_path``; repeat saves of a note reuse the result."""
+    return os.path.dirname(file_path), os.path.basename(file_path), os.path.splitext(file_path)[1]
+
+@lru_cache(maxsize=256)
+def _window_title(file_path: str) -> str:
+    """Main window title for an open note."""
+    return _split_path(file_path)[1] + WINDOW_TITLE_SUFFIX
 
 class FileController:
     """Controller for file operations."""
+
+    # __weakref__: PyQt holds bound-method slots of plain objects weakly
+    __slots__ = (
+        "main_window", "settings_model", "document_model", "editor_logic",
+        "_settings_save_pending", "_note_load_generation", "_save_in_flight",
+        "_resave_path", "_read_cache", "_write_lock", "_write_seqs", "_written_seq", "__weakref__",
+    )
     
     def __init__(self, main_window, settings_model, document_model):
         """Initialize the file controller."""
@@ -31,6 +67,55 @@ class FileController:
         self.settings_model = settings_model
         self.document_model = document_model
         self.editor_logic = EditorLogic()
+        self._settings_save_pending = False
+        self._note_load_generation = 0 # Bumped per note shown; stale chunked inserts stop
+        self._save_in_flight = False
+        self._resave_path = None # Note to save again once the running background save ends
+        self._read_cache = ResultCache(NOTE_READ_CACHE_SIZE)
+        # Every note write takes a sequence number on this thread; a write older than the
+        # last one that reached a file is dropped, so a slow background save cannot
+        # overwrite newer text saved synchronously meanwhile
+        self._write_lock = threading.Lock()
+        self._write_seqs = itertools.count()
+        self._written_seq = {}
+
+    def _schedule_settings_save(self):
+        """Write the settings file once, shortly after the last of a burst of changes, off the GUI thread."""
+        if self._settings_save_pending:
+            return
+        self._settings_save_pending = True
+        QTimer.singleShot(SETTINGS_SAVE_DELAY_MS, self._flush_settings)
+
+    def _flush_settings(self):
+        """Serialize the settings here, so the writer never sees them mid-change, and write them in the background."""
+        if not self._settings_save_pending:
+            return # Already flushed by flush_settings()
+        self._settings_save_pending = False
+        settings_model = self.settings_model
+        _SETTINGS_WRITER.submit(settings_model.write_settings_text, settings_model.to_json(), settings_model.revision)
+
+    def flush_settings(self):
+        """
+        Write any scheduled settings change now and wait until the writer is idle.
+
+        Called when the window closes, so a queued background write cannot land
+        after (and overwrite) the final synchronous save in main().
+        """
+        self._flush_settings()
+        _SETTINGS_WRITER.submit(int).result() # Single worker: returns once earlier writes are done
+    
+    def _default_save_dir(self) -> str:
+        """
+        Directory the open/save dialogs start in.
+
+        The editor's fallback directory (created on disk if missing) is only
+        resolved when no directory is configured.
+
+        Returns:
+            str: The configured default save directory, or the editor's fallback.
+        """
+        return (self.settings_model.get("files", "default_save_directory")
+                or self.editor_logic.get_default_save_directory())
     
     def new_note(self):
         """Create a new, empty note."""
@@ -38,8 +123,8 @@ class FileController:
             return
             
         self.document_model.clear()
-        self.main_window.text_edit.clear()
-        self.main_window.setWindowTitle("Untitled - Smart Contextual Notes Editor")
+        self._show_note_text("")
+        self.main_window.setWindowTitle("Untitled" + WINDOW_TITLE_SUFFIX)
         self.main_window.statusBar.showMessage("New note created")
     
     def open_note(self):
@@ -47,37 +132,129 @@ class FileController:
         if not self._check_unsaved_changes():
             return
             
-        default_dir = self.settings_model.get("files", "default_save_directory", 
-                                         self.editor_logic.get_default_save_directory())
+        default_dir = self._default_save_dir()
             
-        file_path, _ = QFileDialog.getOpenFileName(
-            self.main_window,
-            "Open Note",
-            default_dir,
-            "Text Files (*.txt);;Markdown Files (*.md);;All Files (*)"
-        )
-        
-        if not file_path:
+        # Window-modal open() instead of getOpenFileName(): no nested event loop,
+        # the chosen path arrives through fileSelected
+        dialog = QFileDialog(self.main_window, "Open Note", default_dir, NOTE_FILE_FILTER)
+        dialog.setFileMode(QFileDialog.ExistingFile)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.fileSelected.connect(self._load_note)
+        dialog.open()
+    
+    def _load_note(self, file_path: str):
+        """
+        Read a note on the thread pool and show it once the read completes.
+
+        Large notes or slow disks would otherwise freeze the window while the file is read.
+        A recently read note whose file is unchanged is shown from memory instead.
+
+        Args:
+            file_path (str): Path of the note to open.
+        """
+        cache_key = self._read_cache_key(file_path)
+        cached = self._read_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            self._on_note_read(file_path, cached)
             return
-            
+
+        worker = Worker(self._read_note, file_path)
+        if cache_key:
+            worker.signals.result.connect(partial(self._read_cache.put, cache_key))
+        worker.signals.result.connect(partial(self._on_note_read, file_path))
+        worker.signals.error.connect(partial(self._on_note_read_error, file_path))
+        self.main_window.statusBar.showMessage(f"Opening {file_path}...")
+        QThreadPool.globalInstance().start(worker)
+
+    @staticmethod
+    def _read_cache_key(file_path: str) -> Optional[str]:
+        """
+        Key for a note's cached content; it changes whenever the file is modified.
+
+        Taken before the read, so a file changed during the read is cached under
+        its old key and re-read next time.
+
+        Returns:
+            Optional[str]: The key, or None if the file cannot be stat'ed.
+        """
         try:
-            content = self.editor_logic.read_file(file_path)
-            self.document_model.set_content(content)
-            self.document_model.set_current_file(file_path)
-            self.document_model.mark_saved()
-            
-            self.main_window.text_edit.setText(content)
-            self.main_window.setWindowTitle(f"{os.path.basename(file_path)} - Smart Contextual Notes Editor")
-            self.main_window.statusBar.showMessage(f"Opened {file_path}")
-            
-            self.settings_model.add_recent_file(file_path)
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self.main_window,
-                ERROR_OPENING_FILE_TITLE,
-                f"Could not open file: {str(e)}"
-            )
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return f"{file_path}|{st.st_mtime_ns}|{st.st_size}"
+
+    def _read_note(self, file_path: str, progress_callback=None) -> str:
+        """Worker function: read the note from disk."""
+        return self.editor_logic.read_file(file_path)
+
+    def _on_note_read(self, file_path: str, content: str):
+        """Show a note whose content was read in the background."""
+        self.document_model.set_content(content)
+        self.document_model.set_current_file(file_path)
+        self._show_note_text(content, partial(self._finish_note_open, file_path))
+
+    def _finish_note_open(self, file_path: str):
+        """Mark an opened note clean and update the window once its text is in the editor."""
+        # After the editor's single textChanged, whose handler marks the document dirty
+        self.document_model.mark_saved()
+        self.main_window.setWindowTitle(_window_title(file_path))
+        self.main_window.statusBar.showMessage("Opened " + file_path)
+        
+        self.settings_model.add_recent_file(file_path, save=False)
+        self._schedule_settings_save()
+
+    def _show_note_text(self, content: str, on_shown=None):
+        """
+        Put a note's text into the editor.
+
+        Large notes are inserted in slices, one per event-loop turn, with the
+        editor read-only and its signals blocked until the last slice is in.
+
+        Args:
+            content (str): The note text.
+            on_shown (callable, optional): Called once the whole text is in the editor;
+                not called if another note is shown first.
+        """
+        self._note_load_generation += 1
+        text_edit = self.main_window.text_edit
+        if text_edit.signalsBlocked(): # A previous large note was still being inserted
+            text_edit.setReadOnly(False)
+            text_edit.blockSignals(False)
+        if len(content) < LARGE_NOTE_CHARS:
+            text_edit.setPlainText(content)
+            if on_shown is not None:
+                on_shown()
+            return
+        text_edit.blockSignals(True)
+        text_edit.setReadOnly(True)
+        text_edit.clear()
+        self._insert_note_chunk(self._note_load_generation, content, 0, on_shown)
+
+    def _insert_note_chunk(self, generation: int, content: str, start: int, on_shown=None):
+        """Append one slice of a large note and schedule the next."""
+        if generation != self._note_load_generation:
+            return # Another note was opened meanwhile
+        text_edit = self.main_window.text_edit
+        end = start + NOTE_INSERT_CHUNK_CHARS
+        cursor = text_edit.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(content[start:end])
+        if end < len(content):
+            QTimer.singleShot(0, partial(self._insert_note_chunk, generation, content, end, on_shown))
+            return
+        text_edit.moveCursor(QTextCursor.Start)
+        text_edit.setReadOnly(False)
+        text_edit.blockSignals(False)
+        text_edit.textChanged.emit() # One word-count/title refresh for the whole note
+        if on_shown is not None:
+            on_shown()
+
+    def _on_note_read_error(self, file_path: str, error_tuple: tuple):
+        """Report a note that could not be read."""
+        _, error_message, _ = error_tuple
+        logger.error(f"Error opening file {file_path}: {error_message}")
+        # Nothing is lost when an open fails, so report it without a modal dialog
+        self.main_window.statusBar.showMessage(f"Could not open file: {error_message}", ERROR_STATUS_TIMEOUT_MS)
     
     def save_note(self):
         """
@@ -86,28 +263,104 @@ class FileController:
         Returns:
             bool: True if the save was successful, False otherwise
         """
-        if not self.document_model.get_current_file():
+        document_model = self.document_model
+        file_path = document_model.get_current_file()
+        if not file_path:
             return self.save_note_as()
             
         try:
-            content = self.document_model.get_content()
-            self.editor_logic.write_file(self.document_model.get_current_file(), content)
-                
-            self.document_model.mark_saved()
-            self.main_window.setWindowTitle(f"{os.path.basename(self.document_model.get_current_file())} - Smart Contextual Notes Editor")
-            self.main_window.statusBar.showMessage(f"Saved to {self.document_model.get_current_file()}")
-            
-            self.settings_model.add_recent_file(self.document_model.get_current_file())
-            
+            content = document_model.get_content()
+            # Waits for a background save still writing this note, then supersedes it
+            self._write_note(file_path, content, next(self._write_seqs))
+            self._on_note_written(file_path, content)
             return True
             
         except Exception as e:
-            QMessageBox.critical(
-                self.main_window,
-                ERROR_SAVING_FILE_TITLE,
-                f"Could not save file: {str(e)}"
-            )
+            self._show_save_error(str(e))
             return False
+
+    def save_note_in_background(self):
+        """
+        Save the current note from the Save action without blocking the window.
+
+        The write runs on the thread pool; the title and status bar update when it
+        completes. Callers that need to know whether the save succeeded (such as
+        the unsaved-changes prompt) use save_note instead.
+        """
+        file_path = self.document_model.get_current_file()
+        if not file_path:
+            self.save_note_as()
+            return
+        if self._save_in_flight:
+            # The running save may predate the latest edits; save again when it ends
+            self._resave_path = file_path
+            self.main_window.statusBar.showMessage("Saving " + file_path + " again after the current save...")
+            return
+
+        self._save_in_flight = True
+        content = self.document_model.get_content()
+        worker = Worker(self._write_note, file_path, content, next(self._write_seqs))
+        worker.signals.result.connect(partial(self._on_note_written, file_path, content))
+        worker.signals.error.connect(self._on_note_write_error)
+        worker.signals.finished.connect(self._on_background_save_finished)
+        self.main_window.statusBar.showMessage("Saving " + file_path + "...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _write_note(self, file_path: str, content: str, seq: int, progress_callback=None) -> bool:
+        """
+        Write a note unless a newer write of the same file already happened.
+
+        Args:
+            file_path (str): The note to write.
+            content (str): The text to write.
+            seq (int): Sequence number taken when ``content`` was read from the document.
+
+        Returns:
+            bool: True if written, False if dropped as stale.
+        """
+        with self._write_lock:
+            if seq < self._written_seq.get(file_path, -1):
+                logger.info(f"Dropping stale save of {file_path}; newer text was already written.")
+                return False
+            self.editor_logic.write_file(file_path, content)
+            self._written_seq[file_path] = seq
+            return True
+
+    def _on_note_written(self, file_path: str, content: str, written=True):
+        """Update the window and settings after ``content`` was written to ``file_path``."""
+        if not written:
+            return # Superseded by a newer save, which did the updates
+        # Another note may have been opened while a background save ran
+        if file_path == self.document_model.get_current_file():
+            # Text typed while a background save ran is still unsaved
+            if self.document_model.get_content() == content:
+                self.document_model.mark_saved()
+            self.main_window.setWindowTitle(_window_title(file_path))
+            self.main_window.statusBar.showMessage("Saved to " + file_path)
+        
+        self.settings_model.add_recent_file(file_path, save=False)
+        self._schedule_settings_save()
+
+    def _on_note_write_error(self, error_tuple: tuple):
+        """Report a background save that failed."""
+        _, error_message, _ = error_tuple
+        logger.error(f"Background save failed: {error_message}")
+        self._show_save_error(error_message)
+
+    def _on_background_save_finished(self):
+        self._save_in_flight = False
+        resave_path, self._resave_path = self._resave_path, None
+        document_model = self.document_model
+        if resave_path and resave_path == document_model.get_current_file() and document_model.unsaved_changes:
+            self.save_note_in_background()
+
+    def _show_save_error(self, error_message: str):
+        """Tell the user a save failed; kept modal so unsaved text is not lost unnoticed."""
+        QMessageBox.critical(
+            self.main_window,
+            ERROR_SAVING_FILE_TITLE,
+            f"Could not save file: {error_message}"
+        )
     
     def save_note_as(self):
         """
@@ -116,47 +369,43 @@ class FileController:
         Returns:
             bool: True if the save was successful, False otherwise
         """
-        default_dir = self.settings_model.get("files", "default_save_directory", 
-                                         self.editor_logic.get_default_save_directory())
+        default_dir = self._default_save_dir()
         
         file_path, _ = QFileDialog.getSaveFileName(
             self.main_window,
             "Save Note As",
             default_dir,
-            "Text Files (*.txt);;Markdown Files (*.md);;All Files (*)"
+            NOTE_FILE_FILTER
         )
         
         if not file_path:
             return False
             
         # Add appropriate extension if no extension provided
-        if not os.path.splitext(file_path)[1]:
+        if not _split_path(file_path)[2]:
             default_ext = self.settings_model.get("files", "default_extension", "txt")
             file_path += f".{default_ext}"
             
         try:
-            content = self.document_model.get_content()
-            self.editor_logic.write_file(file_path, content)
+            document_model = self.document_model
+            content = document_model.get_content()
+            self._write_note(file_path, content, next(self._write_seqs))
                 
-            self.document_model.set_current_file(file_path)
-            self.document_model.mark_saved()
-            self.main_window.setWindowTitle(f"{os.path.basename(file_path)} - Smart Contextual Notes Editor")
-            self.main_window.statusBar.showMessage(f"Saved to {file_path}")
-            
-            self.settings_model.add_recent_file(file_path)
+            document_model.set_current_file(file_path)
+            document_model.mark_saved()
+            self.main_window.setWindowTitle(_window_title(file_path))
+            self.main_window.statusBar.showMessage("Saved to " + file_path)
             
-            # Update default save directory
-            self.settings_model.set("files", "default_save_directory", os.path.dirname(file_path))
-            self.settings_model.save_settings()
+            # Update default save directory; both changes go out in one deferred write
+            settings_model = self.settings_model
+            settings_model.set("files", "default_save_directory", _split_path(file_path)[0])
+            settings_model.add_recent_file(file_path, save=False)
+            self._schedule_settings_save()
             
             return True
             
         except Exception as e:
-            QMessageBox.critical(
-                self.main_window,
-                ERROR_SAVING_FILE_TITLE,
-                f"Could not save file: {str(e)}"
-            )
+            self._show_save_error(str(e))
             return False
     
     def _check_unsaved_changes(self):
@@ -229,11 +478,9 @@ class FileController:
 
     def open_note_from_path(self, file_path: str):
         """Open a note from the given absolute file path."""
-        if not os.path.exists(file_path) or os.path.isdir(file_path):
-            QMessageBox.warning(
-                self.main_window,
-                ERROR_OPENING_FILE_TITLE,
-                f"File does not exist or is a directory: {file_path}"
+        if not os.path.isfile(file_path): # One stat instead of exists() + isdir()
+            self.main_window.statusBar.showMessage(
+                f"File does not exist or is a directory: {file_path}", ERROR_STATUS_TIMEOUT_MS
             )
             logger.error(f"Attempted to open invalid path: {file_path}")
             return
@@ -241,25 +488,7 @@ class FileController:
         if not self._check_unsaved_changes():
             return
 
-        try:
-            content = self.editor_logic.read_file(file_path)
-            self.document_model.set_content(content)
-            self.document_model.set_current_file(file_path)
-            self.document_model.mark_saved()
-            
-            self.main_window.text_edit.setText(content)
-            self.main_window.setWindowTitle(f"{os.path.basename(file_path)} - Smart Contextual Notes Editor")
-            self.main_window.statusBar.showMessage(f"Opened {file_path}")
-            
-            self.settings_model.add_recent_file(file_path)
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self.main_window,
-                ERROR_OPENING_FILE_TITLE,
-                f"Could not open file: {str(e)}"
-            )
-            logger.exception(f"Error opening file {file_path}")
+        self._load_note(file_path)
 
     def create_file(self, file_path: str) -> tuple[bool, str]:
         """Creates a new empty file at the given path.
@@ -270,21 +499,17 @@ class FileController:
         Returns:
             A tuple (success: bool, message: str).
         """
-        if os.path.exists(file_path):
-            message = f"File already exists: {file_path}"
-            logger.warning(message)
-            return False, message
         try:
             # Create parent directories if they don't exist
-            parent_dir = os.path.dirname(file_path)
-            if not os.path.exists(parent_dir):
-                os.makedirs(parent_dir)
-                logger.info(f"Created parent directory: {parent_dir}")
+            os.makedirs(_split_path(file_path)[0], exist_ok=True)
             
-            with open(file_path, 'w') as f:
-                f.write('') # Create an empty file
+            create_empty(file_path)
             logger.info(f"Successfully created file: {file_path}")
             return True, f"File created: {file_path}"
+        except FileExistsError:
+            message = f"File already exists: {file_path}"
+            logger.warning(message)
+            return False, message
         except OSError as e:
             message = f"Failed to create file {file_path}: {e.strerror}"
             logger.error(message, exc_info=True)
@@ -303,20 +528,16 @@ class FileController:
         Returns:
             A tuple (success: bool, message: str).
         """
-        if os.path.exists(folder_path):
-            message = f"Folder already exists: {folder_path}"
-            logger.warning(message)
-            return False, message
         try:
+            # No exists() probe first: makedirs reports an existing folder itself
             os.makedirs(folder_path)
             logger.info(f"Successfully created folder: {folder_path}")
             return True, f"Folder created: {folder_path}"
+        except FileExistsError:
+            message = f"Folder already exists: {folder_path}"
+            logger.warning(message)
+            return False, message
         except OSError as e:
-            # Check if it's because the file/folder already exists (though we checked above, race condition possible)
-            if e.errno == 17: # EEXIST - File exists
-                message = f"Folder already exists (race condition): {folder_path}"
-                logger.warning(message)
-                return False, message 
             message = f"Failed to create folder {folder_path}: {e.strerror}"
             logger.error(message, exc_info=True)
             return False, message
@@ -337,16 +558,10 @@ class FileController:
         """
         item_type = "Folder" if os.path.isdir(old_path) else "File"
         try:
-            if not os.path.exists(old_path):
-                message = f"{item_type} does not exist: {old_path}"
-                logger.warning(message)
-                return False, message
-            
-            if os.path.exists(new_path):
-                message = f"Target path already exists: {new_path}"
-                logger.warning(message)
-                return False, message
-
+            # A missing source surfaces as FileNotFoundError from rename(); the target still
+            # needs one probe because POSIX rename() silently replaces an existing file
+            if os.path.lexists(new_path):
+                raise FileExistsError(new_path)
             os.rename(old_path, new_path)
             logger.info(f"Successfully renamed {old_path} to {new_path}")
 
@@ -356,20 +571,28 @@ class FileController:
                 # No need to mark as unsaved, content is the same, just path changed
                 # self.document_model.mark_saved() # Ensure it's still considered saved under the new name
                 if self.main_window: # Check if main_window is available
-                    self.main_window.setWindowTitle(f"{os.path.basename(new_path)} - Smart Contextual Notes Editor")
+                    self.main_window.setWindowTitle(_window_title(new_path))
                     self.main_window.statusBar.showMessage(f"Renamed to {new_path}", 3000)
                 logger.info(f"Updated current open file from {old_path} to {new_path}")
             
             # If the renamed item was a folder containing the current file, update path implicitly
             # No, QFileSystemModel handles this. We only care if the direct file path changes.
 
-            return True, f"{item_type} renamed to {os.path.basename(new_path)}"
+            return True, f"{item_type} renamed to {_split_path(new_path)[1]}"
+        except FileNotFoundError:
+            message = f"{item_type} does not exist: {old_path}"
+            logger.warning(message)
+            return False, message
+        except FileExistsError:
+            message = f"Target path already exists: {new_path}"
+            logger.warning(message)
+            return False, message
         except OSError as e:
-            message = f"Failed to rename {item_type.lower()} '{os.path.basename(old_path)}': {e.strerror}"
+            message = f"Failed to rename {item_type.lower()} '{_split_path(old_path)[1]}': {e.strerror}"
             logger.error(message, exc_info=True)
             return False, message
         except Exception as e:
-            message = f"An unexpected error occurred while renaming {item_type.lower()} '{os.path.basename(old_path)}': {str(e)}"
+            message = f"An unexpected error occurred while renaming {item_type.lower()} '{_split_path(old_path)[1]}': {str(e)}"
             logger.error(message, exc_info=True)
             return False, message
 
@@ -384,16 +607,12 @@ class FileController:
             A tuple (success: bool, message: str).
         """
         item_type = "Folder" if is_dir else "File"
-        item_name = os.path.basename(path)
+        item_name = _split_path(path)[1]
 
         try:
-            if not os.path.exists(path):
-                message = f"{item_type} '{item_name}' not found."
-                logger.warning(message)
-                return False, message
-
+            # No exists() probe first: a missing item surfaces as FileNotFoundError below
             if is_dir:
-                shutil.rmtree(path)
+                remove_tree(path)
                 logger.info(f"Successfully deleted folder: {path}")
             else:
                 os.remove(path)
@@ -410,6 +629,10 @@ class FileController:
                     logger.info(f"Deleted file '{path}' was the current open file. Editor state managed by MainWindow.")
  
             return True, f"{item_type} '{item_name}' deleted successfully."
+        except FileNotFoundError:
+            message = f"{item_type} '{item_name}' not found."
+            logger.warning(message)
+            return False, message
         except OSError as e:
             message = f"Failed to delete {item_type.lower()} '{item_name}': {e.strerror}"
             logger.error(message, exc_info=True)
@@ -18,6 +18,21 @@ from PyQt5.QtWidgets import QTextEdit # For text_edit
 
 logger = logging.getLogger(__name__)
 
+
+def _dict_result_text(result):
+    text = result.get('text')
+    if isinstance(text, str):
+        logger.debug("AI result is dict with 'text' key, using it.")
+        return text
+    return None
+
+
+# Exact-type converters for the common AI result shapes; None falls through to str()
+_RESULT_CONVERTERS = {
+    str: lambda result: result,
+    dict: _dict_result_text,
+}
+
 class AISignalHandler:
     """Handles signals emitted by AIController and updates the UI accordingly."""
 
@@ -66,7 +81,7 @@ class AISignalHandler:
 
     def _on_summarization_result(self, summary_text: str):
         """Handle the result of AI text summarization."""
-        logger.info(f"AI Summarization Result received by handler (first 100 chars): {summary_text[:100]}...")
+        logger.info("AI Summarization Result received by handler (first 100 chars): %s...", summary_text[:100])
         self.progress_manager.hide_progress()
         
         if not summary_text.strip():
@@ -97,8 +112,7 @@ class AISignalHandler:
         error_type, error_message, tb_str = error_details
         logger.error(f"Handler Summarization Error: {error_type.__name__} - {error_message}")
         if tb_str:
-            logger.debug(f"""Traceback (handler):
-{tb_str}""")
+            logger.debug("Traceback (handler):\n%s", tb_str)
 
         if hasattr(self, 'progress_manager'): 
             self.progress_manager.hide_progress()
@@ -139,25 +153,35 @@ Type: {error_type.__name__}"""
             str: The processed text string.
             None: If conversion fails.
         """
-        if isinstance(result, str):
-            return result
-        elif hasattr(result, 'text') and isinstance(getattr(result, 'text', None), str):
-            logger.debug("AI result has .text attribute, using it.")
-            return result.text
-        elif isinstance(result, dict) and 'text' in result and isinstance(result['text'], str):
-            logger.debug("AI result is dict with 'text' key, using it.")
-            return result['text']
+        convert = _RESULT_CONVERTERS.get(type(result))
+        if convert is not None:
+            text = convert(result)
+            if text is not None:
+                return text
         else:
-            # Attempt a fallback conversion, logging a warning
-            try:
-                processed_text = str(result)
-                logger.warning(f"AI result type unexpected ({type(result).__name__}). Converted to string: {processed_text[:100]}...")
-                return processed_text
-            except Exception as e:
-                logger.error(f"Failed to convert AI result of type {type(result).__name__} to string: {e}")
-                # self.progress_manager.on_operation_error(f"Error processing AI result type: {e}") # Done by caller
-                # self.dialog_manager.show_critical("AI Result Error", f"Could not process the AI result type: {type(result).__name__}") # Done by caller
-                return None
+            # Single lookup instead of hasattr() followed by getattr()
+            text = getattr(result, 'text', None)
+            if isinstance(text, str):
+                logger.debug("AI result has .text attribute, using it.")
+                return text
+            # Subclasses of the dispatched types
+            if isinstance(result, str):
+                return result
+            if isinstance(result, dict):
+                text = _dict_result_text(result)
+                if text is not None:
+                    return text
+
+        # Attempt a fallback conversion, logging a warning
+        try:
+            processed_text = str(result)
+            logger.warning("AI result type unexpected (%s). Converted to string: %s...", type(result).__name__, processed_text[:100])
+            return processed_text
+        except Exception as e:
+            logger.error(f"Failed to convert AI result of type {type(result).__name__} to string: {e}")
+            # self.progress_manager.on_operation_error(f"Error processing AI result type: {e}") # Done by caller
+            # self.dialog_manager.show_critical("AI Result Error", f"Could not process the AI result type: {type(result).__name__}") # Done by caller
+            return None
 
     def _validate_and_process_ai_result(self, generated_text_result):
         """Validate the AI result, process it into a string, handle errors/empty cases.
@@ -202,7 +226,7 @@ Type: {error_type.__name__}"""
             self.progress_manager.hide_progress() # Ensure progress is hidden
             return
 
-        logger.info(f"AI Text Generation Successful (Handler). Received {len(processed_text)} characters.")
+        logger.info("AI Text Generation Successful (Handler). Received %d characters.", len(processed_text))
         self.progress_manager.on_progress_update(95) # Nearing completion
         self.progress_manager.show_message("AI text processing complete.")
         
@@ -226,7 +250,7 @@ Type: {error_type.__name__}"""
         
         logger.error(f"AI Text Generation Error (Handler): {err_type_str}: {err_msg}")
         if tb_str:
-            logger.debug(f"Traceback (handler for text gen error):\n{tb_str}")
+            logger.debug("Traceback (handler for text gen error):\n%s", tb_str)
 
         self.progress_manager.hide_progress()
         self.main_window.statusBar().showMessage("Text generation failed.", 5000)
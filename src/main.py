@@ -12,7 +12,7 @@ import logging
 import re # New import
 import resources_rc
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QFile, QTextStream, QVariant # Added QVariant
+from PyQt5.QtCore import QFile, QVariant # Added QVariant
 from views.main_window import MainWindow
 from utils.settings import Settings
 from dotenv import load_dotenv
@@ -24,19 +24,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+STAR_BLOCK_PATTERN = re.compile(r"\*\s*\{([^}]+)\}", re.DOTALL)
+QPROPERTY_PATTERN = re.compile(r"qproperty-(\w+)\s*:\s*([^;]+);")
+URL_VALUE_PATTERN = re.compile(r"url\(([^)]+)\)")
+
 def _read_qss_file(resource_path, current_logger):
     """Helper function to read a QSS file from Qt Resources."""
     qss_file = QFile(resource_path)
-    if not qss_file.exists(): # Check existence for resource paths
-        current_logger.warning(f"Stylesheet resource not found: {resource_path}")
-        return None
-
-    if not qss_file.open(QFile.ReadOnly | QFile.Text):
+    # open() fails for missing resources too, so no separate exists() probe
+    if not qss_file.open(QFile.ReadOnly):
         current_logger.warning(f"Could not open stylesheet resource: {resource_path} - Error: {qss_file.errorString()}")
         return None
-    
-    stream = QTextStream(qss_file)
-    content = stream.readAll()
+
+    # Resources are compiled into resources_rc and already in memory; decode the
+    # bytes in one go rather than through a QTextStream
+    content = bytes(qss_file.readAll()).decode("utf-8")
     qss_file.close()
     current_logger.info(f"Successfully loaded stylesheet from resource: {resource_path}")
     return content
@@ -50,7 +52,7 @@ def apply_base_variables_as_properties(app_instance, base_variables_content, cur
         current_logger.warning("No base variables content provided to apply_base_variables_as_properties.")
         return
 
-    star_block_match = re.search(r"\*\s*\{([^}]+)\}", base_variables_content, re.DOTALL)
+    star_block_match = STAR_BLOCK_PATTERN.search(base_variables_content)
     content_to_search = base_variables_content
     if star_block_match:
         content_to_search = star_block_match.group(1)
@@ -58,7 +60,7 @@ def apply_base_variables_as_properties(app_instance, base_variables_content, cur
     else:
         current_logger.warning("Could not find a global '* { ... }' block in base_variables.qss. Searching the entire file for qproperties. This might be unintended.")
 
-    prop_matches = re.findall(r"qproperty-(\w+)\s*:\s*([^;]+);", content_to_search)
+    prop_matches = QPROPERTY_PATTERN.findall(content_to_search)
 
     if not prop_matches:
         current_logger.warning("No qproperties found in the processed content of base_variables.qss.")
@@ -67,7 +69,7 @@ def apply_base_variables_as_properties(app_instance, base_variables_content, cur
     found_props_count = 0
     for prop_name, prop_value in prop_matches:
         prop_value = prop_value.strip()
-        url_match = re.match(r"url\(([^)]+)\)", prop_value)
+        url_match = URL_VALUE_PATTERN.match(prop_value)
         if url_match:
             prop_value = url_match.group(1).strip().strip("'\"")
 
@@ -114,11 +116,8 @@ def main():
     window = MainWindow(settings)
     
     # Set window geometry from settings
-    width = settings.get("window", "width", 800)
-    height = settings.get("window", "height", 600)
-    x = settings.get("window", "x", 100)
-    y = settings.get("window", "y", 100)
-    window.setGeometry(x, y, width, height)
+    geometry = settings.get_section("window", {"width": 800, "height": 600, "x": 100, "y": 100})
+    window.setGeometry(geometry["x"], geometry["y"], geometry["width"], geometry["height"])
     
     window.show()
     
@@ -126,11 +125,15 @@ def main():
     exit_code = app.exec_()
     
     # Save window geometry to settings before exiting
-    settings.set("window", "width", window.width())
-    settings.set("window", "height", window.height())
-    settings.set("window", "x", window.x())
-    settings.set("window", "y", window.y())
-    settings.save_settings()
+    settings.update("window", {
+        "width": window.width(),
+        "height": window.height(),
+        "x": window.x(),
+        "y": window.y(),
+    })
+    # Everything else is saved as it changes; only write if something is still pending
+    if settings.dirty:
+        settings.save_settings()
     
     sys.exit(exit_code)
 
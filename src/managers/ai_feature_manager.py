@@ -44,6 +44,7 @@ class AIFeatureManager(QObject):
         self.main_window = main_window  # Keep a reference if broad access is needed, or pass specific components
         self.ai_controller = ai_controller
         self.settings = settings
+        self._streamed_chars = 0  # Characters received so far from a streaming generation
 
         # UI components and other managers will be accessed via self.main_window.<attribute>
         # e.g., self.main_window.text_edit, self.main_window.dialog_manager
@@ -64,6 +65,7 @@ class AIFeatureManager(QObject):
         # Text Generation signals
         self.ai_controller.text_generation_started.connect(self._on_text_generation_started)
         self.ai_controller.text_generation_progress.connect(self._on_text_generation_progress) # May not be used
+        self.ai_controller.text_generation_chunk.connect(self._on_text_generation_chunk)
         self.ai_controller.text_generation_result.connect(self._on_text_generation_result)
         self.ai_controller.text_generation_error.connect(self.on_text_generation_error_slot) # Renamed for clarity
         self.ai_controller.text_generation_finished.connect(self._on_text_generation_finished)
@@ -103,12 +105,12 @@ class AIFeatureManager(QObject):
         """Handle AI text summarization progress updates."""
         # Currently, AIManager/AIController might not emit detailed progress for summarization.
         # If it does, this is where self.main_window.progress_manager.update_progress(percentage) would go.
-        logger.debug(f"Summarization progress: {percentage}%")
+        logger.debug("Summarization progress: %d%%", percentage)
         # self.main_window.progress_manager.update_progress(percentage) # Example
 
     def _on_summarization_result(self, summary_text: str):
         """Handle the result of AI text summarization."""
-        logger.info(f"AI Summarization Result received (first 100 chars): {summary_text[:100]}...")
+        logger.info("AI Summarization Result received (first 100 chars): %s...", summary_text[:100])
         self.main_window.progress_manager.hide_progress()
         
         if not summary_text.strip():
@@ -160,10 +162,16 @@ class AIFeatureManager(QObject):
     # Text Generation Slots
     def _on_text_generation_started(self):
         logger.info("AIFeatureManager: AI text generation started.")
+        self._streamed_chars = 0
         self.main_window.progress_manager.show_progress("AI is generating text...")
 
+    def _on_text_generation_chunk(self, chunk_text: str):
+        # Streaming backends deliver partial text; surface it so the user sees output has begun
+        self._streamed_chars += len(chunk_text)
+        self.main_window.statusBar().showMessage(f"AI is generating text... ({self._streamed_chars} characters so far)")
+
     def _on_text_generation_progress(self, percentage: int):
-        logger.debug(f"AIFeatureManager: AI text generation progress: {percentage}%")
+        logger.debug("AIFeatureManager: AI text generation progress: %d%%", percentage)
         self.main_window.progress_manager.update_progress(percentage)
 
     def _on_text_generation_result(self, generated_text_result):
@@ -260,6 +268,11 @@ class AIFeatureManager(QObject):
         # Logic from MainWindow.on_enhance_note_triggered()
         pass
         
+    def trigger_clear_cache(self):
+        """Clears cached AI results so the next requests run the model again."""
+        self.ai_controller.clear_cache()
+        self.main_window.statusBar().showMessage("AI result cache cleared.", 3000)
+
     def trigger_model_selection(self):
         """Opens the model selection dialog and handles model changes."""
         try:
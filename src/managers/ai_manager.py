@@ -6,32 +6,51 @@ AI manager for the Smart Contextual Notes Editor.
 Handles AI operations like summarization and model management.
 """
 
+import itertools
 import logging
 import os
 import traceback # Added for error handling
+from functools import partial
 from PyQt5.QtCore import QObject, QThreadPool, pyqtSignal, pyqtSlot
 
 # Import AI utilities and workers
 from backend.ai_utils import (
     summarize_text_local,
+    summarize_texts_local,
     summarize_text_hf_api,
     summarize_text_gemini_api,
     generate_text_hf_api,
     generate_text_gemini_api,
     configure_gemini_api, # For initializing Gemini API
-    extract_entities_spacy      # Keep for existing entity functionality
+    extract_entities_spacy,     # Keep for existing entity functionality
+    extract_entities_spacy_batch,
+    preload_models
 )
 from utils.threads import (
     LocalSummarizationWorker,
+    LocalBatchSummarizationWorker,
     ApiSummarizationWorker,      # Assuming this is for Hugging Face summarization
     GeminiSummarizationWorker,
     ApiTextGenerationWorker,     # Assuming this is for Hugging Face text generation
     GeminiTextGenerationWorker,
     EntityExtractionWorker,     # Keep for existing entity functionality
+    BatchEntityExtractionWorker,
+)
+from utils.result_cache import (
+    ResultCache, PersistentResultCache, SimilarityCache, PersistentSimilarityCache, user_cache_dir
 )
 
 logger = logging.getLogger(__name__)
 
+# Backend config entry naming the model each (backend, task) pair runs
+_TASK_MODEL_CONFIG_KEYS = {
+    ("local", "summarization"): "local_summarization_model_id",
+    ("huggingface_api", "summarization"): "hf_summarization_model_id",
+    ("huggingface_api", "generation"): "hf_text_generation_model_id",
+    ("google_gemini", "summarization"): "gemini_summarization_model_id",
+    ("google_gemini", "generation"): "gemini_text_generation_model_id",
+}
+
 class AIManager(QObject):
     """Manager for AI operations, supporting multiple backends."""
     
@@ -44,6 +63,7 @@ class AIManager(QObject):
     DEFAULT_GEMINI_GENERATION_MODEL = GEMINI_2_0_FLASH # Default for text generation
     DEFAULT_GEMINI_MODEL = GEMINI_2_0_FLASH # Default for both summarization and text gen
     DEFAULT_ENTITY_EXTRACTION_MODEL = "en_core_web_sm" # Default spaCy model
+    RESULT_CACHE_SIZE = 128 # Recent results kept for exact-repeat requests
     
     # Signals for summarization
     summarization_started_signal = pyqtSignal()
@@ -56,6 +76,7 @@ class AIManager(QObject):
     text_generation_started_signal = pyqtSignal()
     text_generation_progress_signal = pyqtSignal(int)
     text_generation_result_signal = pyqtSignal(str)
+    text_generation_chunk_signal = pyqtSignal(str)  # Partial text from streaming backends
     text_generation_error_signal = pyqtSignal(tuple)
     text_generation_finished_signal = pyqtSignal()
     
@@ -75,6 +96,18 @@ class AIManager(QObject):
         self.settings_model = settings
         self.thread_pool = QThreadPool.globalInstance()
         self.gemini_configured = False # Flag to track if Gemini API has been configured
+        # Last progress of each running worker, per task, keyed by a per-worker id
+        self._worker_progress = {"summarization": {}, "generation": {}}
+        self._worker_ids = itertools.count()
+        if settings is not None and settings.get("ai", "persist_result_cache", True):
+            # Repeat requests in later sessions are answered from disk instead of re-running the model
+            cache_path = os.path.join(user_cache_dir(), "ai_results.sqlite3")
+            self.result_cache = PersistentResultCache(cache_path, self.RESULT_CACHE_SIZE)
+            # Summaries of a note that only changed by a few words are reused
+            self.similar_cache = PersistentSimilarityCache(cache_path)
+        else:
+            self.result_cache = ResultCache(self.RESULT_CACHE_SIZE)
+            self.similar_cache = SimilarityCache()
 
     def _get_ai_backend_config(self) -> dict:
         """Retrieve AI backend configurations from settings."""
@@ -121,12 +154,75 @@ class AIManager(QObject):
         logger.debug(f"AI Backend Config: {config['backend']}, HF Key Present: {bool(config['hf_api_key'])}, Google Key Present: {bool(config['google_api_key'])}")
         return config
 
+    # --- Result Cache ---
+    def _entity_model_id(self) -> str:
+        return self.settings_model.get("ai", "spacy_entity_model_id", self.DEFAULT_ENTITY_EXTRACTION_MODEL) if self.settings_model else self.DEFAULT_ENTITY_EXTRACTION_MODEL
+
+    def _quantize_local(self) -> bool:
+        # Lossy, so opt-in like local_torch_compile
+        return bool(self.settings_model.get("ai", "local_int8_quantization", False)) if self.settings_model else False
+
+    def _cache_scope(self, task: str) -> str:
+        """Backend and model that would serve ``task`` right now; results are only shared within one scope."""
+        if task == "entities":
+            return f"spacy:{self._entity_model_id()}"
+        if not self.settings_model:
+            return f"local:{self.DEFAULT_LOCAL_SUMMARIZATION_MODEL}"
+        config = self._get_ai_backend_config()
+        backend = config["backend"]
+        model_key = _TASK_MODEL_CONFIG_KEYS.get((backend, task))
+        scope = f"{backend}:{config.get(model_key, '') if model_key else ''}"
+        # int8 summaries differ from fp32 ones
+        return scope + ":int8" if backend == "local" and self._quantize_local() else scope
+
+    def cache_key(self, task: str, text: str, *extra) -> str:
+        """Key for a request; includes the active backend and model so a config change never serves stale results."""
+        return ResultCache.make_key(task, text, self._cache_scope(task), *extra)
+
+    def cached_result(self, task: str, text: str, *extra):
+        """Return the cached result of an identical (or, for summaries, nearly identical) earlier request, or None."""
+        result = self.result_cache.get(self.cache_key(task, text, *extra))
+        if not result and task == "summarization":
+            result = self.similar_cache.get(self._cache_scope(task), text)
+        # Empty entries written by earlier versions may be failures; re-run instead
+        return result or None
+
+    def _store_result(self, key: str, result):
+        # Empty results may come from a transient failure; never persist them as the answer
+        if result:
+            self.result_cache.put(key, result)
+
+    def _store_similar(self, scope: str, text: str, result):
+        if result:
+            self.similar_cache.put(scope, text, result)
+
+    def _store_batch_results(self, task: str, scope: str, texts: list, results: list):
+        # scope is captured at dispatch so a settings change mid-request cannot mislabel results
+        for text, result in zip(texts, results):
+            self._store_result(ResultCache.make_key(task, text, scope), result)
+            if task == "summarization":
+                self._store_similar(scope, text, result)
+
     # --- Internal Signal Handlers --- 
     def _handle_worker_summarization_started(self):
         self.summarization_started_signal.emit()
 
-    def _handle_worker_summarization_progress(self, progress_value):
-        self.summarization_progress_signal.emit(progress_value)
+    def _handle_worker_progress(self, task_type: str, worker_id: int, progress_value: int):
+        # Several workers can run one task at once (API fan-out, overlapping requests);
+        # report their average so the bar does not jump between workers
+        running = self._worker_progress[task_type]
+        running[worker_id] = progress_value
+        combined = sum(running.values()) // len(running)
+        if task_type == "summarization":
+            self.summarization_progress_signal.emit(combined)
+        else:
+            self.text_generation_progress_signal.emit(combined)
+
+    def _track_worker_progress(self, task_type: str, worker):
+        """Route ``worker``'s progress into the combined progress of ``task_type``."""
+        worker_id = next(self._worker_ids)
+        worker.signals.progress.connect(partial(self._handle_worker_progress, task_type, worker_id))
+        worker.signals.finished.connect(partial(self._worker_progress[task_type].pop, worker_id, None))
 
     def _handle_worker_summarization_result(self, result_text):
         self.summarization_result_signal.emit(result_text)
@@ -137,11 +233,25 @@ class AIManager(QObject):
     def _handle_worker_summarization_finished(self):
         self.summarization_finished_signal.emit()
 
+    def _handle_worker_summarization_batch_started(self, batch_size):
+        # One started per request, as for entity batches and single requests
+        for _ in range(batch_size):
+            self.summarization_started_signal.emit()
+
+    def _handle_worker_summarization_batch_result(self, summaries):
+        for summary in summaries:
+            self.summarization_result_signal.emit(summary)
+
+    def _handle_worker_summarization_batch_error(self, error_tuple, batch_size):
+        # Every request in the failed batch gets its own error signal
+        for _ in range(batch_size):
+            self.summarization_error_signal.emit(error_tuple)
+
     def _handle_worker_generation_started(self):
         self.text_generation_started_signal.emit()
 
-    def _handle_worker_generation_progress(self, progress_value):
-        self.text_generation_progress_signal.emit(progress_value)
+    def _handle_worker_generation_chunk(self, chunk_text):
+        self.text_generation_chunk_signal.emit(chunk_text)
 
     def _handle_worker_generation_result(self, result_text):
         self.text_generation_result_signal.emit(result_text)
@@ -189,13 +299,13 @@ class AIManager(QObject):
         if task_type == "summarization":
             model_id = config.get("local_summarization_model_id", self.DEFAULT_LOCAL_SUMMARIZATION_MODEL)
             logger.info(f"Preparing local backend for summarization with model: {model_id}")
-            return LocalSummarizationWorker(summarize_text_local, text_or_prompt, model_id=model_id)
+            return LocalSummarizationWorker(summarize_text_local, text_or_prompt, model_id=model_id, quantize=self._quantize_local())
         elif task_type == "generation":
             logger.warning("Local text generation is not currently supported by AIManager.")
-            setup_error_handler((NotImplementedError, "Local text generation not supported.", traceback.format_exc()))
+            setup_error_handler((NotImplementedError, "Local text generation not supported.", ""))
             return None
         logger.error(f"Unknown local task type: {task_type}")
-        setup_error_handler((ValueError, f"Unknown local task type: {task_type}", traceback.format_exc()))
+        setup_error_handler((ValueError, f"Unknown local task type: {task_type}", ""))
         return None
 
     def _get_huggingface_api_worker(self, task_type: str, text_or_prompt: str, config: dict, setup_error_handler, **kwargs):
@@ -215,7 +325,7 @@ class AIManager(QObject):
         if not api_key:
             msg = f"Hugging Face API key is missing for {task_type}."
             logger.error(msg)
-            setup_error_handler((RuntimeError, msg, traceback.format_exc()))
+            setup_error_handler((RuntimeError, msg, ""))
             return None
         
         if task_type == "summarization":
@@ -228,7 +338,7 @@ class AIManager(QObject):
             logger.info(f"Preparing Hugging Face API for text generation with model: {model_id}")
             return ApiTextGenerationWorker(generate_text_hf_api, prompt_text=text_or_prompt, api_key=api_key, model_id=model_id, max_new_tokens=max_new_tokens)
         logger.error(f"Unknown Hugging Face API task type: {task_type}")
-        setup_error_handler((ValueError, f"Unknown Hugging Face API task type: {task_type}", traceback.format_exc()))
+        setup_error_handler((ValueError, f"Unknown Hugging Face API task type: {task_type}", ""))
         return None
 
     def _get_google_gemini_worker(self, task_type: str, text_or_prompt: str, config: dict, setup_error_handler, **kwargs): # Add **kwargs
@@ -248,7 +358,7 @@ class AIManager(QObject):
         if not api_key:
             msg = f"Google Gemini API key is missing for {task_type}."
             logger.error(msg)
-            setup_error_handler((RuntimeError, msg, traceback.format_exc()))
+            setup_error_handler((RuntimeError, msg, ""))
             return None
 
         if not self._configure_gemini_if_needed(api_key, setup_error_handler):
@@ -270,7 +380,7 @@ class AIManager(QObject):
                 max_new_tokens=max_new_tokens_val # Pass as max_new_tokens
             )
         logger.error(f"Unknown Google Gemini task type: {task_type}")
-        setup_error_handler((ValueError, f"Unknown Google Gemini task type: {task_type}", traceback.format_exc()))
+        setup_error_handler((ValueError, f"Unknown Google Gemini task type: {task_type}", ""))
         return None
 
     def _get_worker_for_task(self, task_type: str, backend: str, text_or_prompt: str, config: dict, setup_error_handler, **kwargs):
@@ -283,7 +393,7 @@ class AIManager(QObject):
             return self._get_google_gemini_worker(task_type, text_or_prompt, config, setup_error_handler, **kwargs) # Pass **kwargs
         else:
             logger.error(f"Unknown AI backend for {task_type}: {backend}")
-            setup_error_handler((ValueError, f"Unknown AI backend: {backend}", traceback.format_exc()))
+            setup_error_handler((ValueError, f"Unknown AI backend: {backend}", ""))
             return None
 
     def _create_and_dispatch_worker(self, task_type: str, text_or_prompt: str, config: dict, **kwargs):
@@ -308,7 +418,6 @@ class AIManager(QObject):
         if task_type == "summarization":
             signal_handlers = {
                 "started": self._handle_worker_summarization_started,
-                "progress": self._handle_worker_summarization_progress,
                 "result": self._handle_worker_summarization_result,
                 "error": self._handle_worker_summarization_error,
                 "finished": self._handle_worker_summarization_finished,
@@ -317,15 +426,15 @@ class AIManager(QObject):
         elif task_type == "generation":
             signal_handlers = {
                 "started": self._handle_worker_generation_started,
-                "progress": self._handle_worker_generation_progress,
                 "result": self._handle_worker_generation_result,
+                "chunk": self._handle_worker_generation_chunk,
                 "error": self._handle_worker_generation_error,
                 "finished": self._handle_worker_generation_finished,
             }
             setup_error_handler = self._handle_worker_generation_error
         else:
             logger.error(f"Unknown task type for worker dispatch: {task_type}")
-            self.summarization_error_signal.emit((ValueError, f"Unknown task type: {task_type}", traceback.format_exc()))
+            self.summarization_error_signal.emit((ValueError, f"Unknown task type: {task_type}", ""))
             return
 
         try:
@@ -333,11 +442,17 @@ class AIManager(QObject):
 
             if worker:
                 logger.info(f"Connecting signals for {backend} {task_type} worker.")
+                extra = (kwargs.get("max_new_tokens"),) if task_type == "generation" else ()
+                worker.signals.result.connect(partial(self._store_result, self.cache_key(task_type, text_or_prompt, *extra)))
+                if task_type == "summarization":
+                    worker.signals.result.connect(partial(self._store_similar, self._cache_scope(task_type), text_or_prompt))
                 worker.signals.started.connect(signal_handlers["started"])
-                worker.signals.progress.connect(signal_handlers["progress"])
+                self._track_worker_progress(task_type, worker)
                 worker.signals.result.connect(signal_handlers["result"])
                 worker.signals.error.connect(signal_handlers["error"])
                 worker.signals.finished.connect(signal_handlers["finished"])
+                if "chunk" in signal_handlers:
+                    worker.signals.chunk.connect(signal_handlers["chunk"])
                 
                 logger.info(f"Starting {backend} {task_type} worker in thread pool.")
                 self.thread_pool.start(worker)
@@ -372,6 +487,26 @@ class AIManager(QObject):
         config = self._get_ai_backend_config()
         self._create_and_dispatch_worker("generation", prompt_text, config, max_new_tokens=max_new_tokens)
 
+    def preload(self, progress_callback=None):
+        """
+        Load the local models the current configuration will use. Blocking; run it on a worker.
+
+        Returns:
+            List[str]: The model IDs that were loaded.
+        """
+        config = self._get_ai_backend_config()
+        summarization_model_id = None
+        if config.get("backend") == "local":
+            summarization_model_id = config.get("local_summarization_model_id", self.DEFAULT_LOCAL_SUMMARIZATION_MODEL)
+        # Entity extraction is always local spaCy, whatever the summarization backend
+        spacy_model_id = self._entity_model_id()
+        # Compiling costs a long one-off warm-up and needs a recent torch, so it is opt-in
+        compile_summarizer = bool(self.settings_model.get("ai", "local_torch_compile", False)) if self.settings_model else False
+        return preload_models(
+            summarization_model_id, spacy_model_id, progress_callback=progress_callback,
+            compile_summarizer=compile_summarizer, quantize_summarizer=self._quantize_local()
+        )
+
     def request_entity_extraction(self, text: str):
         """Request entity extraction using the configured backend (currently SpaCy via EntityExtractionWorker)."""
         logger.info(f"AIManager: request_entity_extraction called for text (first 50 chars): {text[:50]}...")
@@ -379,11 +514,7 @@ class AIManager(QObject):
 
         # Entity extraction currently uses a local SpaCy model by default.
         # If it were to support multiple backends, backend selection logic would be needed here.
-        model_id = self.settings_model.get(
-            "ai", 
-            "spacy_entity_model_id", 
-            self.DEFAULT_ENTITY_EXTRACTION_MODEL
-        )
+        model_id = self._entity_model_id()
 
         try:
             worker = EntityExtractionWorker(
@@ -398,6 +529,7 @@ class AIManager(QObject):
             # Assuming EntityExtractionWorker has standard WorkerSignals: started, progress, result, error, finished
             # No 'started' signal from worker needed here as we emit AIManager's started signal above.
             # No 'progress' signal typically for entity extraction via SpaCy in this setup.
+            worker.signals.result.connect(partial(self._store_result, self.cache_key("entities", text)))
             worker.signals.result.connect(self.entity_extraction_result_signal.emit)
             worker.signals.error.connect(self.entity_extraction_error_signal.emit)
             worker.signals.finished.connect(self.entity_extraction_finished_signal.emit)
@@ -410,6 +542,87 @@ class AIManager(QObject):
             self.entity_extraction_error_signal.emit(error_tuple)
             self.entity_extraction_finished_signal.emit() # Ensure finished is emitted
 
+    def summarize_batch(self, texts: list):
+        """
+        Summarize several texts, emitting one started and one result (or error) signal per text in input order.
+
+        The local backend feeds the whole list to a single pipeline call. API backends
+        have no batch endpoint, so each text gets its own worker and the requests run
+        concurrently in the thread pool.
+        """
+        if not texts:
+            return
+        if len(texts) == 1:
+            self.summarize_text(texts[0])
+            return
+
+        logger.info(f"AIManager.summarize_batch called with {len(texts)} texts")
+        config = self._get_ai_backend_config()
+        if config.get("backend", "local") != "local":
+            for text in texts:
+                self._create_and_dispatch_worker("summarization", text, config)
+            return
+
+        model_id = config.get("local_summarization_model_id", self.DEFAULT_LOCAL_SUMMARIZATION_MODEL)
+        batch_size = len(texts)
+        try:
+            worker = LocalBatchSummarizationWorker(summarize_texts_local, list(texts), model_id=model_id, quantize=self._quantize_local())
+            worker.signals.started.connect(partial(self._handle_worker_summarization_batch_started, batch_size))
+            self._track_worker_progress("summarization", worker)
+            worker.signals.result.connect(partial(self._store_batch_results, "summarization", self._cache_scope("summarization"), list(texts)))
+            worker.signals.result.connect(self._handle_worker_summarization_batch_result)
+            worker.signals.error.connect(lambda error_tuple: self._handle_worker_summarization_batch_error(error_tuple, batch_size))
+            worker.signals.finished.connect(self._handle_worker_summarization_finished)
+
+            logger.info(f"Starting local batch summarization worker for {batch_size} texts.")
+            self.thread_pool.start(worker)
+        except Exception as e:
+            logger.error(f"AIManager: Failed to start batch summarization worker: {e}", exc_info=True)
+            self._handle_worker_summarization_batch_error((type(e), str(e), traceback.format_exc()), batch_size)
+
+    def extract_entities_batch(self, texts: list):
+        """
+        Extract entities from several texts with one spaCy pass.
+
+        Each text gets its own started, result (or error) and finished signal, in
+        input order, exactly as if it had been requested on its own.
+        """
+        if not texts:
+            return
+        if len(texts) == 1:
+            self.request_entity_extraction(texts[0])
+            return
+
+        logger.info(f"AIManager: extract_entities_batch called for {len(texts)} texts")
+        batch_size = len(texts)
+        for _ in range(batch_size):
+            self.entity_extraction_started_signal.emit()
+        model_id = self._entity_model_id()
+
+        try:
+            worker = BatchEntityExtractionWorker(extract_entities_spacy_batch, texts=list(texts), model_id=model_id)
+            worker.signals.result.connect(partial(self._store_batch_results, "entities", self._cache_scope("entities"), list(texts)))
+            worker.signals.result.connect(self._handle_worker_entity_batch_result)
+            worker.signals.error.connect(lambda error_tuple: self._handle_worker_entity_batch_error(error_tuple, batch_size))
+
+            self.thread_pool.start(worker)
+            logger.debug(f"AIManager: BatchEntityExtractionWorker started for model {model_id}.")
+        except Exception as e:
+            error_tuple = (type(e), e, traceback.format_exc())
+            logger.error(f"AIManager: Failed to create or start BatchEntityExtractionWorker: {e}", exc_info=True)
+            self._handle_worker_entity_batch_error(error_tuple, batch_size)
+
+    def _handle_worker_entity_batch_result(self, entity_lists):
+        for entities in entity_lists:
+            self.entity_extraction_result_signal.emit(entities)
+            self.entity_extraction_finished_signal.emit()
+
+    def _handle_worker_entity_batch_error(self, error_tuple, batch_size):
+        # Every request in the failed batch gets its own error and finished signal
+        for _ in range(batch_size):
+            self.entity_extraction_error_signal.emit(error_tuple)
+            self.entity_extraction_finished_signal.emit()
+
     def extract_entities_with_spacy(self, text: str, model_id: str = 'en_core_web_sm', **kwargs):
         logger.debug(f"AIManager.extract_entities_with_spacy called with model: {model_id}")
         progress_callback = kwargs.get('progress_callback')
@@ -7,6 +7,8 @@ Model for document data and operations.
 
 class DocumentModel:
     """Model for document data and operations."""
+
+    __slots__ = ("current_file", "unsaved_changes", "content")
     
     def __init__(self):
         """Initialize the document model."""
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batching helpers for the Smart Contextual Notes Editor.
+Groups variable-length inputs so batched model calls waste little work on padding.
+"""
+
+from typing import List, Sequence
+
+
+def length_buckets(lengths: Sequence[int], max_ratio: float = 1.5) -> List[List[int]]:
+    """
+    Group input indices into buckets of similar length.
+
+    Indices are sorted by length and a new bucket is started whenever the next
+    item would make the bucket's longest-to-shortest ratio exceed ``max_ratio``.
+    Every item in a bucket is padded to the bucket's longest item, so keeping the
+    ratio small bounds the padding wasted on short inputs.
+
+    Args:
+        lengths (Sequence[int]): Length of each input, in caller order.
+        max_ratio (float, optional): Largest allowed longest/shortest ratio within a bucket.
+
+    Returns:
+        List[List[int]]: Buckets of indices into ``lengths``, shortest bucket first.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    buckets = []
+    current = []
+    shortest = 0
+    for index in order:
+        length = lengths[index]
+        if current and length > max(shortest, 1) * max_ratio:
+            buckets.append(current)
+            current = []
+        if not current:
+            shortest = length
+        current.append(index)
+    if current:
+        buckets.append(current)
+    return buckets
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Result cache for the Smart Contextual Notes Editor.
+Keeps recent AI results so identical requests can be answered without re-running a model.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+
+def user_cache_dir() -> str:
+    """Per-user cache directory for the application (XDG_CACHE_HOME aware)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "smart-notes-editor")
+
+
+class ResultCache:
+    """Bounded least-recently-used map from request keys to AI results."""
+
+    def __init__(self, capacity: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity (int, optional): Maximum number of results kept before the oldest is evicted.
+        """
+        self.capacity = capacity
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(task: str, text: str, *extra) -> str:
+        """
+        Build a cache key for a request.
+
+        Args:
+            task (str): The request type, e.g. "summarization".
+            text (str): The request input; it is hashed rather than stored.
+            *extra: Further parameters that change the result (backend, token limit, ...).
+
+        Returns:
+            str: A fixed-size key.
+        """
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return "|".join([task, digest, *map(str, extra)])
+
+    def get(self, key: str):
+        """Return the cached result for ``key`` (marking it recently used), or None."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value):
+        """Store ``value`` under ``key``, evicting the least recently used entry when full."""
+        if value is None:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached result."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SimilarityCache:
+    """
+    Near-duplicate lookup for long inputs.
+
+    Each input is reduced to its set of word 3-grams; a query is served the result
+    of the stored input with the highest Jaccard similarity, if that is at least
+    ``threshold``. Editing a few words of a long note keeps the similarity close
+    to 1, while real rewrites fall well below it.
+    """
+
+    SHINGLE_SIZE = 3
+    MIN_SHINGLES = 20 # Shorter inputs are left to the exact-match cache
+
+    def __init__(self, capacity: int = 64, threshold: float = 0.9):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity (int, optional): Inputs remembered; the oldest is forgotten first.
+            threshold (float, optional): Minimum Jaccard similarity for a hit.
+        """
+        self.threshold = threshold
+        self._entries = deque(maxlen=capacity)
+
+    @classmethod
+    def _shingles(cls, text: str) -> frozenset:
+        # crc32 rather than hash(): string hashes are salted per process, and
+        # shingles must compare equal across sessions once persisted
+        words = text.lower().split()
+        n = cls.SHINGLE_SIZE
+        return frozenset(zlib.crc32(" ".join(words[i:i + n]).encode("utf-8")) for i in range(len(words) - n + 1))
+
+    def get(self, scope: str, text: str):
+        """Return the result of the most similar stored input within ``scope``, or None."""
+        shingles = self._shingles(text)
+        if len(shingles) < self.MIN_SHINGLES:
+            return None
+        best_score, best_value = 0.0, None
+        for entry_scope, entry_shingles, value in self._entries:
+            if entry_scope != scope:
+                continue
+            score = len(shingles & entry_shingles) / len(shingles | entry_shingles)
+            if score > best_score:
+                best_score, best_value = score, value
+        return best_value if best_score >= self.threshold else None
+
+    def put(self, scope: str, text: str, value):
+        """Remember ``value`` as the result for ``text`` within ``scope``."""
+        shingles = self._shingles(text)
+        if value is not None and len(shingles) >= self.MIN_SHINGLES:
+            self._entries.append((scope, shingles, value))
+
+    def clear(self):
+        """Forget every stored input."""
+        self._entries.clear()
+
+
+class _SQLiteStore:
+    """
+    Lazily opened SQLite file with a single background writer thread.
+
+    All reads that can be deferred run on the writer thread too, so opening the
+    file and creating tables never happens on the caller's (GUI) thread. A file
+    that cannot be opened disables the store instead of raising, so callers
+    degrade to their in-memory behaviour. Use shared() so caches on the same
+    file share one connection and writer.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path: str):
+        """Return the store for ``path``, creating it on first use."""
+        with cls._shared_lock:
+            store = cls._shared.get(path)
+            if store is None:
+                store = cls._shared[path] = cls(path)
+            return store
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path (str): SQLite file; its directory is created on first use.
+        """
+        self.path = path
+        self._schema = []
+        self._conn = None
+        self._disabled = False
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+
+    def add_schema(self, schema):
+        """Queue SQL statements that create a caller's tables; they run before any later queued work."""
+        self._writer.submit(self._apply_schema, list(schema))
+
+    def _apply_schema(self, schema):
+        with self._lock:
+            self._schema.extend(schema)
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    for sql in schema:
+                        conn.execute(sql)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache schema setup failed: {e}")
+
+    def _connection(self):
+        if self._conn is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                for sql in self._schema:
+                    conn.execute(sql)
+                conn.commit()
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                # Fall back to memory only; a broken cache file must not break AI features
+                logger.warning(f"Result cache at {self.path} unavailable, using memory only: {e}")
+                self._disabled = True
+        return self._conn
+
+    def query(self, sql: str, params=()):
+        """Run a read query on the calling thread and return all rows (empty on failure)."""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return []
+            try:
+                return conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache read failed: {e}")
+                return []
+
+    def load(self, sql: str, params, callback):
+        """Run a read query on the writer thread and pass its rows (empty on failure) to ``callback`` there."""
+        self._writer.submit(lambda: callback(self.query(sql, params)))
+
+    def write(self, statements, then=None):
+        """
+        Queue ``(sql, params)`` pairs to run in one transaction on the writer thread.
+
+        Args:
+            statements: The statements to run.
+            then (callable, optional): Called on the writer thread after the transaction commits.
+        """
+        self._writer.submit(self._run, statements, then)
+
+    def _run(self, statements, then=None):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+                return
+        if then is not None:
+            then()
+
+    def flush(self):
+        """Block until all work queued so far has run."""
+        self._writer.submit(int).result() # Single worker: runs after everything queued before it
+
+    def close(self):
+        """Finish queued work, close the file and forget this store; shared() then opens a fresh one."""
+        with self._shared_lock:
+            if self._shared.get(self.path) is self:
+                del self._shared[self.path]
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PersistentResultCache(ResultCache):
+    """
+    ResultCache backed by an SQLite file so results survive restarts.
+
+    The in-memory LRU stays the fast path, and get() never touches SQLite. The
+    set of keys on disk is loaded on the writer thread when the cache is created.
+    A key that is on disk but not in memory counts as a miss; its row is read on
+    the writer thread and the value is pulled into memory on the next lookup.
+    Writes, access-time updates and eviction run on the writer thread too.
+    """
+
+    def __init__(self, path: str, capacity: int = 128, max_rows: int = 5000):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite file to persist results in; its directory is created if needed.
+            capacity (int, optional): Results kept in memory.
+            max_rows (int, optional): Results kept on disk before least recently used rows are evicted.
+        """
+        super().__init__(capacity)
+        self.max_rows = max_rows
+        self._disk_keys = None # Filled and updated on the writer thread only; None until loaded
+        self._fetched = {} # key -> (generation, value or None); set on the writer thread, merged on the caller's
+        self._fetching = set() # Keys with a disk read in flight; caller's thread only
+        self._generation = 0 # Bumped by clear() so reads still in flight are dropped
+        self._store = _SQLiteStore.shared(path)
+        self._store.add_schema([
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)",
+        ])
+        self._store.load("SELECT key FROM results", (), self._on_keys_loaded)
+
+    def _on_keys_loaded(self, rows):
+        self._disk_keys = {key for (key,) in rows}
+
+    def get(self, key: str):
+        """
+        Return the result for ``key`` from memory, or None.
+
+        A miss on a key stored on disk starts reading it in the background, so a
+        later lookup of the same key hits.
+        """
+        self._merge_fetched()
+        value = super().get(key)
+        if value is not None:
+            return value
+        disk_keys = self._disk_keys
+        if disk_keys is None or key not in disk_keys or key in self._fetching:
+            return None
+        self._fetching.add(key)
+        self._store.load("SELECT value FROM results WHERE key = ?", (key,), partial(self._on_value_loaded, key, self._generation))
+        return None
+
+    def _on_value_loaded(self, key: str, generation: int, rows):
+        value = json.loads(rows[0][0]) if rows else None
+        self._fetched[key] = (generation, value)
+        if value is not None:
+            # Already on the writer thread, so run the update here rather than queueing it
+            self._store._run([("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))])
+
+    def _merge_fetched(self):
+        if not self._fetched:
+            return
+        for key in list(self._fetched):
+            generation, value = self._fetched.pop(key)
+            self._fetching.discard(key)
+            # Skip reads from before a clear(), and never replace a value put() since
+            if value is not None and generation == self._generation and key not in self._entries:
+                super().put(key, value)
+
+    def put(self, key: str, value):
+        """Store ``value`` in memory now and on disk in the background."""
+        if value is None:
+            return
+        super().put(key, value)
+        self._store.write([
+            ("INSERT OR REPLACE INTO results (key, value, accessed) VALUES (?, ?, ?)", (key, json.dumps(value), time.time())),
+            ("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_rows,)),
+        ], then=partial(self._on_key_written, key))
+
+    def _on_key_written(self, key: str):
+        if self._disk_keys is not None:
+            self._disk_keys.add(key)
+
+    def clear(self):
+        """Drop every cached result, in memory and on disk."""
+        super().clear()
+        self._generation += 1
+        self._store.write([("DELETE FROM results", ())], then=self._on_cleared)
+
+    def _on_cleared(self):
+        if self._disk_keys is not None:
+            self._disk_keys.clear()
+
+
+class PersistentSimilarityCache(SimilarityCache):
+    """
+    SimilarityCache whose entries are also kept in an SQLite file.
+
+    Only the shingle hashes and results are stored, never the input text.
+    The most recent ``capacity`` entries are read on the writer thread when the
+    cache is created and merged in on the next lookup.
+    """
+
+    def __init__(self, path: str, capacity: int = 64, threshold: float = 0.9):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite file to persist entries in; may be shared with a PersistentResultCache.
+            capacity (int, optional): Inputs remembered, in memory and on disk.
+            threshold (float, optional): Minimum Jaccard similarity for a hit.
+        """
+        super().__init__(capacity, threshold)
+        self._loaded_entries = None # Set on the writer thread, merged on the caller's thread
+        self._discard_loaded = False # Set by clear() so a load still in flight is dropped
+        self._store = _SQLiteStore.shared(path)
+        self._store.add_schema([
+            "CREATE TABLE IF NOT EXISTS similar (id INTEGER PRIMARY KEY AUTOINCREMENT, scope TEXT NOT NULL, shingles TEXT NOT NULL, value TEXT NOT NULL)",
+        ])
+        self._store.load("SELECT scope, shingles, value FROM similar ORDER BY id DESC LIMIT ?", (capacity,), self._on_entries_loaded)
+
+    def _on_entries_loaded(self, rows):
+        if self._discard_loaded:
+            return
+        self._loaded_entries = [(scope, frozenset(json.loads(shingles)), json.loads(value)) for scope, shingles, value in reversed(rows)]
+
+    def _merge_loaded(self):
+        loaded, self._loaded_entries = self._loaded_entries, None
+        if loaded:
+            # Older, loaded entries go first so entries added this session are kept on overflow
+            self._entries = deque(loaded + list(self._entries), maxlen=self._entries.maxlen)
+
+    def get(self, scope: str, text: str):
+        """Return the result of the most similar stored input within ``scope``, or None."""
+        self._merge_loaded()
+        return super().get(scope, text)
+
+    def put(self, scope: str, text: str, value):
+        """Remember ``value`` for ``text`` within ``scope``, in memory now and on disk in the background."""
+        self._merge_loaded()
+        shingles = self._shingles(text)
+        if value is None or len(shingles) < self.MIN_SHINGLES:
+            return
+        self._entries.append((scope, shingles, value))
+        self._store.write([
+            ("INSERT INTO similar (scope, shingles, value) VALUES (?, ?, ?)", (scope, json.dumps(sorted(shingles)), json.dumps(value))),
+            ("DELETE FROM similar WHERE id NOT IN (SELECT id FROM similar ORDER BY id DESC LIMIT ?)", (self._entries.maxlen,)),
+        ])
+
+    def clear(self):
+        """Forget every stored input, in memory and on disk."""
+        super().clear()
+        self._discard_loaded = True
+        self._loaded_entries = None
+        self._store.write([("DELETE FROM similar", ())])
@@ -9,9 +9,12 @@ Handles loading and saving application settings.
 import os
 import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
 class Settings:
     """Handles application settings."""
     
@@ -55,6 +58,9 @@ class Settings:
                 "huggingface_summarization_model_id": "facebook/bart-large-cnn", # Default model ID
                 "huggingface_text_generation_model_id": "gpt2",  # Default text generation model ID
                 "google_api_key": "",
+                "local_torch_compile": False,  # torch.compile the local summarizer at preload
+                "local_int8_quantization": False,  # Lossy int8 local summarizer: less memory, summaries may differ
+                "persist_result_cache": True,  # Keep AI results on disk across sessions
                 "max_links_for_qna": 3 # Default number of links to fetch for Q&A
             },
             "enhancement_templates": {}, 
@@ -67,6 +73,9 @@ class Settings:
         
         # Current settings
         self.config = self.load_settings()
+        self._write_lock = threading.Lock()
+        self._revision = 0 # Bumped by every change made through this class
+        self._saved_revision = 0 # Revision last written to the settings file
         
     def load_settings(self):
         """
@@ -95,8 +104,58 @@ class Settings:
     def save_settings(self):
         """Save current settings to the settings file."""
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as file:
-                json.dump(self.config, file, indent=4)
+            return self.write_settings_text(self.to_json(), self._revision)
+        except Exception as e:
+            logger.error(f"Error saving settings: {str(e)}")
+            return False
+
+    def to_json(self):
+        """
+        Serialize the current settings.
+
+        Returns:
+            str: The settings file content for the current configuration.
+        """
+        return json.dumps(self.config, indent=4)
+
+    @property
+    def revision(self):
+        """Counter bumped by every settings change; pass it to write_settings_text with the matching to_json()."""
+        return self._revision
+
+    @property
+    def dirty(self):
+        """True if a change has not yet been written to the settings file."""
+        return self._revision != self._saved_revision
+
+    def _mark_changed(self):
+        self._revision += 1
+
+    def write_settings_text(self, text, revision=None):
+        """
+        Write already-serialized settings to the settings file.
+
+        Safe to call from a background thread; concurrent writes are serialized.
+
+        Args:
+            text (str): Settings file content, as returned by to_json().
+            revision (int, optional): The revision ``text`` was serialized at; once written,
+                changes up to it no longer count as unsaved. Text older than the revision
+                already saved is not written.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        try:
+            with self._write_lock:
+                if revision is not None and revision <= self._saved_revision:
+                    # A newer (or the same) revision is already on disk
+                    logger.debug(f"Skipping stale settings write (revision {revision})")
+                    return True
+                with open(self.settings_file, 'w', encoding='utf-8') as file:
+                    file.write(text)
+                if revision is not None:
+                    self._saved_revision = revision
             logger.info("Settings saved to file")
             return True
         except Exception as e:
@@ -120,6 +179,19 @@ class Settings:
         except KeyError:
             return default
     
+    def get_section(self, section, defaults=None):
+        """
+        Get all values of a settings section in one lookup.
+
+        Args:
+            section (str): The settings section (e.g., 'window', 'editor').
+            defaults (dict, optional): Values used for keys missing from the section.
+
+        Returns:
+            dict: A new dict of the section's values over ``defaults``.
+        """
+        return {**(defaults or {}), **self.config.get(section, {})}
+    
     def set(self, section, key, value):
         """
         Set a setting value.
@@ -136,18 +208,39 @@ class Settings:
             if section not in self.config:
                 self.config[section] = {}
             
-            self.config[section][key] = value
+            if self.config[section].get(key, _MISSING) != value:
+                self.config[section][key] = value
+                self._mark_changed()
             return True
         except Exception as e:
             logger.error(f"Error setting {section}.{key}: {str(e)}")
             return False
+
+    def update(self, section, values):
+        """
+        Set several values of one section at once.
+
+        Args:
+            section (str): The settings section (e.g., 'window', 'editor').
+            values (dict): Setting keys and the values to set.
+
+        Returns:
+            bool: True if any value changed, False otherwise.
+        """
+        current = self.config.setdefault(section, {})
+        changed = {key: value for key, value in values.items() if current.get(key, _MISSING) != value}
+        if changed:
+            current.update(changed)
+            self._mark_changed()
+        return bool(changed)
     
-    def add_recent_file(self, file_path):
+    def add_recent_file(self, file_path, save=True):
         """
         Add a file to the recent files list.
         
         Args:
             file_path (str): Path to the file to add.
+            save (bool, optional): Write the settings file now; callers that schedule their own save pass False.
         """
         recent_files = self.config["files"]["recent_files"]
         
@@ -160,9 +253,11 @@ class Settings:
         
         # Keep only the 10 most recent files
         self.config["files"]["recent_files"] = recent_files[:10]
+        self._mark_changed()
         
         # Save the settings
-        self.save_settings()
+        if save:
+            self.save_settings()
     
     def get_enhancement_templates(self):
         """Get all enhancement templates.
@@ -189,6 +284,7 @@ class Settings:
             if "enhancement_templates" not in self.config:
                 self.config["enhancement_templates"] = {}
             self.config["enhancement_templates"][template_name] = prompt_text
+            self._mark_changed()
             return self.save_settings()
         except Exception as e:
             logger.error(f"Error saving enhancement template '{template_name}': {str(e)}")
@@ -206,6 +302,7 @@ class Settings:
         try:
             if "enhancement_templates" in self.config and template_name in self.config["enhancement_templates"]:
                 del self.config["enhancement_templates"][template_name]
+                self._mark_changed()
                 return self.save_settings()
             else:
                 logger.warning(f"Attempted to delete non-existent template: {template_name}")
@@ -240,6 +337,7 @@ class Settings:
             self.config["workspaces"]["list"] = []
 
         self.config["workspaces"]["list"].append({"name": name, "path": path})
+        self._mark_changed()
         # If this is the first workspace, set it as active
         if len(self.config["workspaces"]["list"]) == 1:
             self.set_active_workspace_name(name) # This will call save_settings
@@ -256,6 +354,7 @@ class Settings:
             return False
 
         self.config["workspaces"]["list"] = updated_workspaces
+        self._mark_changed()
 
         # If the removed workspace was active, clear the active workspace name
         active_name = self.get_active_workspace_name()
@@ -275,6 +374,7 @@ class Settings:
 
         if name is None:
             self.config['workspaces']['active_name'] = None
+            self._mark_changed()
             logger.info("Active workspace cleared (set to None).")
             # No need to add None to recents
             return self.save_settings()
@@ -282,6 +382,7 @@ class Settings:
         workspaces = self.get_workspaces() # Assuming this uses self.config
         if any(ws['name'] == name for ws in workspaces):
             self.config['workspaces']['active_name'] = name
+            self._mark_changed()
             self.add_to_recent_workspaces(name) # Add to recents when set active
             logger.info(f"Active workspace set to: {name}")
             return self.save_settings()
@@ -328,5 +429,6 @@ class Settings:
         
         # Trim the list if it exceeds max size
         self.config['workspaces']['recent_workspaces_names'] = recent_list[:self.MAX_RECENT_WORKSPACES]
+        self._mark_changed()
         logger.debug(f"Recent workspaces updated: {self.config['workspaces']['recent_workspaces_names']}")
         # self.save() # Saving is handled by set_active_workspace_name or other higher-level calls
@@ -22,12 +22,14 @@ class WorkerSignals(QObject):
         error: Signal emitted when an error occurs (error type, error value, traceback)
         result: Signal emitting the result of the worker
         progress: Signal emitting the progress of the worker (int from 0-100)
+        chunk: Signal emitting partial text as a streaming worker receives it
     """
     started = pyqtSignal()
     finished = pyqtSignal()
     error = pyqtSignal(tuple)
     result = pyqtSignal(object)
     progress = pyqtSignal(int)
+    chunk = pyqtSignal(str)
 
 
 class Worker(QRunnable):
@@ -205,7 +207,7 @@ class LocalSummarizationWorker(Worker):
     Inherits from Worker and calls a local summarization function.
     """
     
-    def __init__(self, summarize_local_fn, text: str, model_id: str):
+    def __init__(self, summarize_local_fn, text: str, model_id: str, quantize: bool = False):
         """
         Initialize the local summarization worker.
         
@@ -213,11 +215,33 @@ class LocalSummarizationWorker(Worker):
             summarize_local_fn: The local summarization function to call (e.g., summarize_text_local).
             text (str): The text to summarize.
             model_id (str): The model ID to be used locally.
+            quantize (bool, optional): Use the int8-quantized model.
         """
-        super().__init__(summarize_local_fn, text=text, model_id=model_id)
+        super().__init__(summarize_local_fn, text=text, model_id=model_id, quantize=quantize)
         logger.info("LocalSummarizationWorker initialized for %s with model: %s" % (summarize_local_fn.__name__, model_id))
 
 
+class LocalBatchSummarizationWorker(Worker):
+    """
+    Worker thread for summarizing several texts in one local model call.
+    
+    Inherits from Worker; the result signal carries a list of summaries in input order.
+    """
+    
+    def __init__(self, summarize_batch_fn, texts: list, model_id: str, quantize: bool = False):
+        """
+        Initialize the local batch summarization worker.
+        
+        Args:
+            summarize_batch_fn: The batch summarization function to call (e.g., summarize_texts_local).
+            texts (list): The texts to summarize.
+            model_id (str): The model ID to be used locally.
+            quantize (bool, optional): Use the int8-quantized model.
+        """
+        super().__init__(summarize_batch_fn, texts=texts, model_id=model_id, quantize=quantize)
+        logger.info("LocalBatchSummarizationWorker initialized for %s with model: %s (%d texts)" % (summarize_batch_fn.__name__, model_id, len(texts)))
+
+
 class ApiTextGenerationWorker(Worker):
     """
     Worker thread specifically for API-based text generation.
@@ -326,7 +350,8 @@ class GeminiTextGenerationWorker(Worker):
             'text_prompt': text_prompt,
             'api_key': api_key,
             'model_name': model_name,
-            'max_output_tokens': max_new_tokens # Map to what generate_text_gemini_api expects
+            'max_output_tokens': max_new_tokens, # Map to what generate_text_gemini_api expects
+            'chunk_callback': self._emit_chunk # Stream partial text out as it arrives
         }
         if generation_config is not None:
             init_kwargs['generation_config'] = generation_config
@@ -336,6 +361,9 @@ class GeminiTextGenerationWorker(Worker):
         super().__init__(generate_gemini_fn, **init_kwargs)
         logger.info(f"GeminiTextGenerationWorker initialized for {generate_gemini_fn.__name__} with model: {model_name}")
 
+    def _emit_chunk(self, text: str):
+        self.signals.chunk.emit(text)
+
 class EntityExtractionWorker(Worker):
     """Worker thread for entity extraction."""
     def __init__(self, extract_fn, text: str, model_id: str = None):
@@ -350,6 +378,20 @@ class EntityExtractionWorker(Worker):
         logger.info("EntityExtractionWorker initialized.")
 
 
+class BatchEntityExtractionWorker(Worker):
+    """Worker thread for entity extraction over several texts at once."""
+    def __init__(self, extract_batch_fn, texts: list, model_id: str = None):
+        """
+        Initialize the batch entity extraction worker.
+        Args:
+            extract_batch_fn: The batch entity extraction function to call.
+            texts (list): The texts to extract entities from.
+            model_id (str, optional): Specific model ID if applicable.
+        """
+        super().__init__(extract_batch_fn, texts=texts, model_id=model_id)
+        logger.info("BatchEntityExtractionWorker initialized for %d texts." % len(texts))
+
+
 class WebContentSummarizationWorker(Worker):
     """
     Worker thread for summarizing web content.
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Token estimation for the Smart Contextual Notes Editor.
+Kept free of model dependencies so the UI can import it at startup.
+"""
+
+import math
+
+# Constants for token estimation (very rough)
+# Average characters per token can vary greatly by model and language.
+# 4 is a common general heuristic for English.
+CHARS_PER_TOKEN_ESTIMATE = 4
+
+def estimate_tokens(text: str) -> int:
+    """Provides a very rough estimation of token count based on character length."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
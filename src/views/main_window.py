@@ -14,7 +14,7 @@ from PyQt5.QtWidgets import (
     QFileDialog, QSplitter, QTreeWidget, QTreeWidgetItem, QInputDialog, # Changed QTreeView, QFileSystemModel to QTreeWidget, QTreeWidgetItem
     QStatusBar, QLabel, QMessageBox, QToolBar, QAbstractItemView
 )
-from PyQt5.QtCore import Qt, QThreadPool, QDir, QModelIndex
+from PyQt5.QtCore import Qt, QThreadPool, QDir, QModelIndex, QTimer
 from PyQt5.QtGui import QTextCursor, QIcon
 from typing import Optional, Tuple
 
@@ -56,7 +56,8 @@ from .ui_factory import (
     populate_toolbar
 )
 
-from backend.ai_utils import estimate_tokens 
+# Lightweight: importing backend.ai_utils here would load transformers/spaCy at startup
+from utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -192,6 +193,7 @@ class MainWindow(QMainWindow):
 
         self.settings_dialog = None
         self.ai_services_dialog = None
+        self._ai_warmup_scheduled = False
         # Removed obsolete state flags: _pending_enhancement_data, _selection_based_enhancement_info
 
         self.update_title()
@@ -514,9 +516,18 @@ class MainWindow(QMainWindow):
             self.progress_manager.hide_progress()
 
     # --- Window Event Handlers ---
+    def showEvent(self, event):
+        """Start warming up the AI stack once the window is on screen."""
+        super().showEvent(event)
+        if not self._ai_warmup_scheduled:
+            self._ai_warmup_scheduled = True
+            # Deferred to the next event-loop pass so the first paint isn't delayed
+            QTimer.singleShot(0, self.ai_controller.warm_up_ai_manager)
+
     def closeEvent(self, event):
         """Handles the window close event, checking for unsaved changes."""
         logger.debug("Close event triggered.")
+        accept = True
         if self.document_model.unsaved_changes:
             logger.info("Unsaved changes detected on close.")
             reply = self.dialog_manager.show_question(
@@ -528,23 +539,27 @@ class MainWindow(QMainWindow):
 
             if reply == QMessageBox.Save:
                 logger.debug("User chose Save.")
-                # Attempt to save. save_file returns True on success, False on failure/cancel.
-                if self.file_controller.save_file():
+                # Attempt to save. save_note returns True on success, False on failure/cancel.
+                accept = self.file_controller.save_note()
+                if accept:
                     logger.info("File saved successfully. Accepting close event.")
-                    event.accept()
                 else:
                     # Save failed or was cancelled by the user (e.g., in Save As dialog)
                     logger.info("Save operation failed or cancelled. Ignoring close event.")
-                    event.ignore()
             elif reply == QMessageBox.Discard:
                 logger.info("User chose Discard. Accepting close event.")
-                event.accept()
             else: 
                 logger.info("User chose Cancel or closed the dialog. Ignoring close event.")
-                event.ignore()
+                accept = False
         else:
             logger.debug("No unsaved changes. Accepting close event.")
-            event.accept() 
+
+        if accept:
+            # After the prompt: saving from it records a recent file on a timer that never fires once closed
+            self.file_controller.flush_settings()
+            event.accept()
+        else:
+            event.ignore()
 
     # --- Summary Panel Setup ---
     # Removed _setup_summary_dock_widget method
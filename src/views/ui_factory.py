@@ -70,7 +70,7 @@ def create_file_menu(main_window, menubar):
     save_action = QAction("&Save", main_window)
     save_action.setShortcut("Ctrl+S")
     save_action.setStatusTip("Save the current note")
-    save_action.triggered.connect(main_window.file_controller.save_note)
+    save_action.triggered.connect(main_window.file_controller.save_note_in_background)
     file_menu.addAction(save_action)
     
     save_as_action = QAction("Save &As...", main_window)
@@ -175,6 +175,12 @@ def create_ai_tools_menu(main_window, menubar):
     action_select_model.triggered.connect(main_window.ai_feature_manager.trigger_model_selection)
     ai_tools_menu.addAction(action_select_model)
 
+    # Clear cached AI results action
+    clear_ai_cache_action = QAction("&Clear AI Result Cache", main_window)
+    clear_ai_cache_action.setStatusTip("Forget cached summaries, generations and entities so they are computed again")
+    clear_ai_cache_action.triggered.connect(main_window.ai_feature_manager.trigger_clear_cache)
+    ai_tools_menu.addAction(clear_ai_cache_action)
+
     return ai_tools_menu
 
 def create_view_menu(main_window, menubar):
@@ -230,7 +236,7 @@ def populate_toolbar(main_window, toolbar):
     
     save_action = QAction(QIcon.fromTheme("document-save"), "Save", main_window)
     save_action.setStatusTip("Save the current note")
-    save_action.triggered.connect(main_window.file_controller.save_note)
+    save_action.triggered.connect(main_window.file_controller.save_note_in_background)
     toolbar.addAction(save_action)
     
 
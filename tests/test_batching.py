@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the batching utilities.
+"""
+
+import unittest
+from utils.batching import length_buckets
+
+class TestLengthBuckets(unittest.TestCase):
+    """Test cases for length_buckets."""
+
+    def test_groups_similar_lengths(self):
+        """Short and long inputs land in separate buckets, shortest first."""
+        buckets = length_buckets([50, 2000, 60, 1900, 70])
+        self.assertEqual(buckets, [[0, 2, 4], [3, 1]])
+
+    def test_covers_every_index_once(self):
+        """Every input index appears in exactly one bucket."""
+        lengths = [5, 1, 40, 12, 7, 300, 8, 9]
+        buckets = length_buckets(lengths)
+        flattened = sorted(i for bucket in buckets for i in bucket)
+        self.assertEqual(flattened, list(range(len(lengths))))
+
+    def test_empty_input(self):
+        """No inputs means no buckets."""
+        self.assertEqual(length_buckets([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
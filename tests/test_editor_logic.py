@@ -8,7 +8,7 @@ Unit tests for the editor logic module.
 import unittest
 import os
 import tempfile
-from backend.editor_logic import EditorLogic
+from backend.editor_logic import EditorLogic, remove_tree, PARALLEL_DELETE_MIN_FILES
 
 class TestEditorLogic(unittest.TestCase):
     """Test cases for the EditorLogic class."""
@@ -71,5 +71,29 @@ class TestEditorLogic(unittest.TestCase):
         self.assertTrue(suggested_name.endswith(".txt"))
         self.assertGreater(len(suggested_name), 5)  # Should have a reasonable length
 
+    def test_remove_tree_large_folder(self):
+        """A nested folder with enough files to take the parallel path is removed completely."""
+        root = os.path.join(self.test_dir.name, "notes")
+        for sub in ("a", os.path.join("a", "b"), "c"):
+            os.makedirs(os.path.join(root, sub))
+            for i in range(PARALLEL_DELETE_MIN_FILES):
+                with open(os.path.join(root, sub, f"{i}.txt"), "w") as f:
+                    f.write("x")
+        remove_tree(root)
+        self.assertFalse(os.path.exists(root))
+
+    def test_write_file_keeps_symlink(self):
+        """Saving through a symlinked note updates its target and leaves no temp files."""
+        target = os.path.join(self.test_dir.name, "target.txt")
+        link = os.path.join(self.test_dir.name, "link.txt")
+        with open(target, "w") as f:
+            f.write("old")
+        os.symlink(target, link)
+        self.editor_logic.write_file(link, "new")
+        self.assertTrue(os.path.islink(link))
+        with open(target) as f:
+            self.assertEqual(f.read(), "new")
+        self.assertEqual(sorted(os.listdir(self.test_dir.name)), ["link.txt", "target.txt"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for the result cache module.
+"""
+
+import os
+import tempfile
+import unittest
+from utils.result_cache import ResultCache, SimilarityCache, PersistentResultCache, PersistentSimilarityCache
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the exact-match LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """The entry not touched for longest is dropped when over capacity."""
+        cache = ResultCache(capacity=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+
+    def test_key_depends_on_parameters(self):
+        """Different tasks or extra parameters give different keys for the same text."""
+        key = ResultCache.make_key("generation", "prompt", "local", 100)
+        self.assertNotEqual(key, ResultCache.make_key("generation", "prompt", "local", 200))
+        self.assertNotEqual(key, ResultCache.make_key("summarization", "prompt", "local", 100))
+
+class TestSimilarityCache(unittest.TestCase):
+    """Test cases for the near-duplicate cache."""
+
+    def setUp(self):
+        self.text = " ".join("word%d" % i for i in range(200))
+
+    def test_small_edit_hits(self):
+        """Changing one word of a long text still finds the stored result."""
+        cache = SimilarityCache()
+        cache.put("local", self.text, "summary")
+        self.assertEqual(cache.get("local", self.text.replace("word7 ", "edited ")), "summary")
+
+    def test_other_scope_or_text_misses(self):
+        """A different scope or unrelated text does not hit."""
+        cache = SimilarityCache()
+        cache.put("local", self.text, "summary")
+        self.assertIsNone(cache.get("google_gemini", self.text))
+        self.assertIsNone(cache.get("local", " ".join("other%d" % i for i in range(200))))
+
+    def test_short_text_not_cached(self):
+        """Inputs too short for meaningful similarity are ignored."""
+        cache = SimilarityCache()
+        cache.put("local", "a short note", "summary")
+        self.assertIsNone(cache.get("local", "a short note"))
+
+class TestPersistentResultCache(unittest.TestCase):
+    """Test cases for the on-disk exact-match cache."""
+
+    def test_entries_survive_new_instance(self):
+        """A result stored by one instance is read back from disk by a later one on the same file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            cache = PersistentResultCache(path)
+            cache.put("key", ["entity"])
+            cache._store.close()
+            reopened = PersistentResultCache(path)
+            reopened._store.flush() # Key index is loaded on the writer thread
+            self.assertIsNone(reopened.get("key")) # Misses while the row is read in the background
+            reopened._store.flush()
+            self.assertEqual(reopened.get("key"), ["entity"])
+            self.assertIsNone(reopened.get("other"))
+            reopened._store.close()
+
+    def test_caches_on_one_file_share_a_store(self):
+        """Exact-match and similarity caches on the same file use one connection and writer."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            results = PersistentResultCache(path)
+            similar = PersistentSimilarityCache(path)
+            self.assertIs(results._store, similar._store)
+            results._store.close()
+
+class TestPersistentSimilarityCache(unittest.TestCase):
+    """Test cases for the on-disk near-duplicate cache."""
+
+    def test_entries_survive_new_instance(self):
+        """A result stored by one instance is found by a later one on the same file."""
+        text = " ".join("word%d" % i for i in range(200))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            cache = PersistentSimilarityCache(path)
+            cache.put("local", text, "summary")
+            cache._store.close()
+            reopened = PersistentSimilarityCache(path)
+            reopened._store.flush() # Stored entries are read on the writer thread
+            self.assertEqual(reopened.get("local", text.replace("word7 ", "edited ")), "summary")
+            reopened._store.close()
+
+if __name__ == '__main__':
+    unittest.main()